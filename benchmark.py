@@ -0,0 +1,182 @@
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from itertools import product
+from time import perf_counter, sleep
+from minesweeper_model import BitPackedMinesweeperModel, MinesweeperModel, NumpyMinesweeperModel, np
+
+# Az alapértelmezett táblaméretek (sor- és oszlopszám) és aknasűrűségek.
+DEFAULT_SIZES = (8, 16, 30, 100, 500, 1000, 2000)
+DEFAULT_DENSITIES = (0.01, 0.15, 0.5, 0.9)
+
+
+def measure(func, repeat: int) -> float:
+    """A függvényt repeat alkalommal végrehajtja, és a legrövidebb futásidővel tér vissza másodpercben."""
+    best = float('inf')
+    for _ in range(repeat):
+        t0 = perf_counter()
+        func()
+        best = min(best, perf_counter() - t0)
+    return best
+
+
+def model_classes() -> list[type[MinesweeperModel]]:
+    """A mérendő modellosztályok. A NumpyMinesweeperModel csak telepített numpy esetén."""
+    return [MinesweeperModel, BitPackedMinesweeperModel] + ([NumpyMinesweeperModel] if np is not None else [])
+
+
+def mine_count_for(size: int, density: float) -> int:
+    """A size x size méretű táblához tartozó aknaszám az adott sűrűség mellett (legalább 1, legfeljebb cellaszám - 1)."""
+    return min(max(round(size * size * density), 1), size * size - 1)
+
+
+def benchmark_model(sizes, densities, repeat: int) -> dict[str, float]:
+    """A modellműveletek futásidejének mérése táblaméretenként, aknasűrűségenként és modellosztályonként."""
+    results = {}
+    for model_class, size, density in product(model_classes(), sizes, densities):
+        mine_count = mine_count_for(size, density)
+        suffix = f'{model_class.__name__}/{size}x{size}/{density}'
+        # Nagy tábláknál egyetlen mérés is elég, és így a teljes futásidő is elfogadható marad.
+        rounds = repeat if size * size <= 10 ** 5 else 1
+        results[f'construct/{suffix}'] = measure(lambda: model_class(size, size, mine_count), rounds)
+        model = model_class(size, size, mine_count)
+        center = (size // 2, size // 2)
+        results[f'generate/{suffix}'] = measure(lambda: model.generate_mines_randomly(safe_cell=center, safe_neighbours=True),
+                                                rounds)
+        results[f'adjacent_counts/{suffix}'] = measure(
+            lambda: [model.number_of_mines_in_adjacent_cells(ri, ci) for ri, ci in product(range(size), range(size))], rounds)
+        results[f'cascade/{suffix}'] = measure(lambda: model.reveal_safe_cells(*center), rounds)
+        print(f'{suffix}: kész', file=sys.stderr)
+    return results
+
+
+def start_virtual_display() -> subprocess.Popen | None:
+    """Ha nincs elérhető grafikus megjelenítő, de az Xvfb telepítve van, akkor elindít egy virtuális X megjelenítőt,
+    és visszaadja a folyamatát. Egyébként None értékkel tér vissza."""
+    if os.environ.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None
+    display = ':99'
+    process = subprocess.Popen(['Xvfb', display, '-screen', '0', '1920x1080x24', '-nolisten', 'tcp'],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # Megvárjuk, amíg a megjelenítő fogadni tudja a kapcsolatokat.
+    for _ in range(50):
+        if os.path.exists(f'/tmp/.X11-unix/X{display[1:]}'):
+            break
+        sleep(0.1)
+    os.environ['DISPLAY'] = display
+    return process
+
+
+def benchmark_game_field(sizes, densities, repeat: int, max_widget_size: int, max_canvas_size: int,
+                         max_viewport_size: int) -> dict[str, float]:
+    """A játékmező (GameField, CanvasGameField és ViewportGameField) létrehozásának futásidő-mérése. A cellánként egy
+    widgetet létrehozó GameField csak max_widget_size, a CanvasGameField csak max_canvas_size, a ViewportGameField
+    csak max_viewport_size méretig kerül mérésre. A ViewportGameField esetén a görgetés és a nagyítás is mérésre kerül."""
+    import tkinter as tk
+    from main import MineSweeper
+    results = {}
+    field_options = {'GameField': (dict(single_canvas=False, viewport=False), max_widget_size),
+                     'CanvasGameField': (dict(single_canvas=True, viewport=False), max_canvas_size),
+                     'ViewportGameField': (dict(viewport=True), max_viewport_size)}
+    for name, size, density in product(field_options, sizes, densities):
+        options, max_size = field_options[name]
+        if size > max_size:
+            continue
+        try:
+            app = MineSweeper(size, size, mine_count_for(size, density), **options)
+        except tk.TclError as exc:
+            print(f'A játékmező mérése kimarad: {exc}', file=sys.stderr)
+            return results
+
+        def create_game_field():
+            app._create_game_field()
+            app.update_idletasks()
+
+        results[f'gamefield/{name}/{size}x{size}/{density}'] = measure(create_game_field, repeat)
+        if name == 'ViewportGameField':
+            canvas = app.game_field.canvas
+
+            def pan():
+                # Átlósan végiggörgetünk a táblán, minden lépés után kirajzolva a nézetet.
+                for step in range(1, 51):
+                    canvas.xview_moveto(step / 50)
+                    canvas.yview_moveto(step / 50)
+                    app.update_idletasks()
+
+            def zoom():
+                for step in (-1, -1, 1, 1):
+                    app.game_field.zoom(step)
+                    app.update_idletasks()
+
+            results[f'pan/{name}/{size}x{size}/{density}'] = measure(pan, repeat) / 50
+            results[f'zoom/{name}/{size}x{size}/{density}'] = measure(zoom, repeat) / 4
+        app.destroy()
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float,
+            noise_floor: float = 1e-3) -> list[tuple[str, float, float]]:
+    """Visszaadja azokat a méréseket (név, alapérték, új érték), amelyek futásideje a tolerance aránynál többel nőtt
+    az alapértékhez képest. A noise_floor másodpercnél kisebb eltérések nem számítanak visszaesésnek."""
+    return [(name, baseline[name], seconds) for name, seconds in sorted(results.items())
+            if name in baseline and seconds > baseline[name] * (1 + tolerance) and seconds - baseline[name] > noise_floor]
+
+
+def current_commit() -> str | None:
+    """Az aktuális git commit azonosítója, ha elérhető."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Az aknakereső modelljének és játékmezőjének futásidő-mérése.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--densities', type=float, nargs='+', default=DEFAULT_DENSITIES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', default='benchmark_baseline.json')
+    parser.add_argument('--update-baseline', action='store_true', help='az eredmények mentése alapértékként')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='a megengedett relatív lassulás')
+    parser.add_argument('--no-gui', action='store_true', help='a játékmező mérésének kihagyása')
+    parser.add_argument('--max-widget-size', type=int, default=100)
+    parser.add_argument('--max-canvas-size', type=int, default=500)
+    parser.add_argument('--max-viewport-size', type=int, default=5000)
+    args = parser.parse_args()
+
+    results = benchmark_model(args.sizes, args.densities, args.repeat)
+    if not args.no_gui:
+        xvfb = start_virtual_display()
+        try:
+            results.update(benchmark_game_field(args.sizes, args.densities, args.repeat, args.max_widget_size,
+                                                args.max_canvas_size, args.max_viewport_size))
+        finally:
+            if xvfb is not None:
+                xvfb.terminate()
+
+    report = {'meta': {'commit': current_commit(), 'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                       'python': platform.python_version(), 'platform': platform.platform()},
+              'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f'Az eredmények mentése: {args.output}')
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f'Az alapértékek mentése: {args.baseline}')
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline['results'], args.tolerance)
+        for name, old, new in regressions:
+            print(f'VISSZAESÉS {name}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms ({new / old - 1:+.0%})')
+        if regressions:
+            sys.exit(1)
+        print(f'Nincs visszaesés az alapértékekhez ({baseline["meta"].get("commit")}) képest.')
@@ -0,0 +1,253 @@
+from collections import OrderedDict, deque
+from random import Random, getrandbits
+from minesweeper_model import MinesweeperModel
+
+
+class EndlessMinesweeperModel:
+    """Végtelen, minden irányban tetszőleges (negatív is lehet) sor- és oszlopindexekkel címzett aknamező modellje.
+    A sík chunk_size x chunk_size méretű darabokra (chunkokra) oszlik. Egy darab aknái csak az első rá vonatkozó
+    lekérdezéskor kerülnek elhelyezésre, a közös seed értékből és a darab koordinátáiból determinisztikusan, így egy
+    darab bármikor újra előállítható. Az aknákat a legutóbb használt darabok legfeljebb max_cached_chunks méretű
+    tárolója (LRU) tartalmazza, a régóta nem használt darabok eltávolításra kerülnek. A felfedett és a zászlós
+    cellák állapota ettől külön, darabonkénti bitsíkokban tárolódik, és csak a már érintett darabokra, így a memóriaigény
+    a bejárt területtel, nem pedig a tábla méretével arányos.
+    A cellaállapotok és a felfedés kezelése a MinesweeperModel azonos nevű metódusaival egyezik meg, így a modell
+    a HeadlessGame és a játékmező számára is használható. A győzelmi feltétel soha nem teljesül.
+    """
+
+    HIDDEN, REVEALED, FLAGGED, EXPLODED = (MinesweeperModel.HIDDEN, MinesweeperModel.REVEALED,
+                                           MinesweeperModel.FLAGGED, MinesweeperModel.EXPLODED)
+
+    def __init__(self, seed: int | None = None, density: float = 10 / 64, chunk_size: int = 32,
+                 max_cached_chunks: int = 1024, max_cascade_cells: int = 100_000):
+        # A density az aknák aránya a darabokban (alapértelmezés szerint a 8x8-as, 10 aknás táblával azonos),
+        # a max_cascade_cells az egy felfedéssel felfedhető cellák legnagyobb száma.
+        if not 0 < density < 1:
+            raise ValueError('Az aknasűrűség 0 és 1 közötti szám kell, hogy legyen.')
+        if not isinstance(chunk_size, int) or chunk_size < 8:
+            raise ValueError('A darabok mérete egy legalább 8 értékű egész szám kell, hogy legyen.')
+        self.seed = getrandbits(63) if seed is None else seed
+        self.chunk_size = chunk_size
+        self.mines_per_chunk = round(density * chunk_size * chunk_size)
+        self.max_cached_chunks = max_cached_chunks
+        self.max_cascade_cells = max_cascade_cells
+        self.safe_coords = frozenset()  # Az aknamentesen hagyott cellák (az első felfedett cella és szomszédai).
+        self._mine_chunks = OrderedDict()  # A darabok aknáinak bitmaszkja a darabkoordináták szerint, LRU sorrendben.
+        self.generated_chunk_count = 0  # Az előállított (az újra előállítottakat is beleértve) darabok száma.
+        self.reset_state()
+
+    def _check_indexes(self, row_index, column_index):
+        if not isinstance(row_index, int):
+            raise TypeError('A sorindex nem egész szám.')
+        if not isinstance(column_index, int):
+            raise TypeError('Az oszlopindex nem egész szám.')
+
+    def generate_mines_randomly(self, safe_cell: tuple[int, int] | None = None, safe_neighbours: bool = False,
+                                seed: int | None = None):
+        """Az aknaelrendezés meghatározása (a paraméterek jelentése a MinesweeperModel generate_mines_randomly()
+        metódusáéval azonos). Az aknák ténylegesen csak a darabok első lekérdezésekor kerülnek elhelyezésre."""
+        if seed is not None:
+            self.seed = seed
+        if safe_cell is None:
+            self.safe_coords = frozenset()
+        else:
+            self.safe_coords = frozenset([safe_cell] + (self.adjacent_cells_coords(*safe_cell) if safe_neighbours else []))
+        self._mine_chunks.clear()
+
+    def _generate_chunk(self, chunk_row, chunk_column) -> int:
+        """A darab aknáinak bitmaszkja: a darabon belüli sorfolytonos sorszámnak megfelelő bit jelzi az aknát."""
+        size = self.chunk_size
+        mines = 0
+        for local_index in Random(f'{self.seed}:{chunk_row}:{chunk_column}').sample(range(size * size), self.mines_per_chunk):
+            mines |= 1 << local_index
+        for ri, ci in self.safe_coords:
+            if (ri // size, ci // size) == (chunk_row, chunk_column):
+                mines &= ~(1 << (ri % size * size + ci % size))
+        self.generated_chunk_count += 1
+        return mines
+
+    def _chunk_mines(self, chunk_row, chunk_column) -> int:
+        """A darab aknáinak bitmaszkja a tárolóból, vagy ha nincs benne, akkor előállítva. A tároló megtelése esetén
+        a legrégebben használt darab kerül eltávolításra."""
+        key = (chunk_row, chunk_column)
+        mines = self._mine_chunks.get(key)
+        if mines is None:
+            mines = self._mine_chunks[key] = self._generate_chunk(chunk_row, chunk_column)
+            if len(self._mine_chunks) > self.max_cached_chunks:
+                self._mine_chunks.popitem(last=False)
+        else:
+            self._mine_chunks.move_to_end(key)
+        return mines
+
+    @property
+    def cached_chunk_count(self) -> int:
+        """A tárolóban levő darabok száma."""
+        return len(self._mine_chunks)
+
+    def get_value(self, row_index, column_index):
+        """Visszaadja megadott sor- és oszlopindexekkel azonosított cella értékét."""
+        self._check_indexes(row_index, column_index)
+        size = self.chunk_size
+        chunk_row, local_row = divmod(row_index, size)
+        chunk_column, local_column = divmod(column_index, size)
+        return self._chunk_mines(chunk_row, chunk_column) >> (local_row * size + local_column) & 1
+
+    def adjacent_cells_coords(self, row_index, column_index) -> list[tuple[int, int]]:
+        """Az argumentumban megadott cella nyolc szomszédjának sor- és oszlopindexeit tartalmazó tuple-ok listája."""
+        self._check_indexes(row_index, column_index)
+        return [(row_index + dr, column_index + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+
+    def number_of_mines_in_adjacent_cells(self, row_index, column_index) -> int:
+        """Visszaadja, hogy az argumentumban megadott cella szomszédai összesen hány aknát tartalmaznak. A darab
+        belsejében levő cellák szomszédait egyetlen bitmaszkból, a darabhatáron levőkét a szomszédos darabokból számolja."""
+        self._check_indexes(row_index, column_index)
+        size = self.chunk_size
+        chunk_row, local_row = divmod(row_index, size)
+        chunk_column, local_column = divmod(column_index, size)
+        if 0 < local_row < size - 1 and 0 < local_column < size - 1:
+            mines = self._chunk_mines(chunk_row, chunk_column)
+            local_index = local_row * size + local_column
+            # A cella feletti és alatti három-három, valamint a két oldalsó szomszéd bitjei.
+            return ((mines >> (local_index - size - 1) & 0b111).bit_count() + (mines >> (local_index + size - 1) & 0b111).bit_count()
+                    + (mines >> (local_index - 1) & 1) + (mines >> (local_index + 1) & 1))
+        return sum(self.get_value(ri, ci) for ri, ci in self.adjacent_cells_coords(row_index, column_index))
+
+    def reset_state(self):
+        """Minden cellát fel nem fedett, zászló nélküli állapotba hoz, és nullázza az állapotszámlálókat."""
+        self._revealed_chunks = {}  # A felfedett cellák bitsíkjai a darabkoordináták szerint.
+        self._flagged_chunks = {}  # A zászlós cellák bitsíkjai a darabkoordináták szerint.
+        self.revealed_count = 0  # A felfedett cellák száma.
+        self.flagged_count = 0  # A zászlóval jelölt cellák száma.
+        self.exploded_coords = None  # Annak a cellának a koordinátái, amelyen a felfedett akna felrobbant.
+
+    def _get_state(self, planes: dict, row_index, column_index) -> bool:
+        size = self.chunk_size
+        chunk_row, local_row = divmod(row_index, size)
+        chunk_column, local_column = divmod(column_index, size)
+        if (plane := planes.get((chunk_row, chunk_column))) is None:
+            return False
+        local_index = local_row * size + local_column
+        return bool(plane[local_index >> 3] >> (local_index & 7) & 1)
+
+    def _set_state(self, planes: dict, row_index, column_index, value: bool):
+        size = self.chunk_size
+        chunk_row, local_row = divmod(row_index, size)
+        chunk_column, local_column = divmod(column_index, size)
+        key, local_index = (chunk_row, chunk_column), local_row * size + local_column
+        if (plane := planes.get(key)) is None:
+            if not value:
+                return
+            plane = planes[key] = bytearray((size * size + 7) // 8)
+        if value:
+            plane[local_index >> 3] |= 1 << (local_index & 7)
+        else:
+            plane[local_index >> 3] &= ~(1 << (local_index & 7)) & 0xFF
+            if not any(plane):
+                del planes[key]
+
+    def is_revealed(self, row_index, column_index) -> bool:
+        """True értékkel tér vissza, ha a megadott cella fel van fedve."""
+        return self._get_state(self._revealed_chunks, row_index, column_index)
+
+    def is_flagged(self, row_index, column_index) -> bool:
+        """True értékkel tér vissza, ha a megadott cella zászlóval van jelölve."""
+        return self._get_state(self._flagged_chunks, row_index, column_index)
+
+    def cell_state(self, row_index, column_index) -> str:
+        """A megadott cella állapotával (HIDDEN, REVEALED, FLAGGED vagy EXPLODED) tér vissza."""
+        self._check_indexes(row_index, column_index)
+        if (row_index, column_index) == self.exploded_coords:
+            return self.EXPLODED
+        if self.is_revealed(row_index, column_index):
+            return self.REVEALED
+        return self.FLAGGED if self.is_flagged(row_index, column_index) else self.HIDDEN
+
+    def is_victory(self) -> bool:
+        """A végtelen táblán a győzelmi feltétel soha nem teljesül."""
+        return False
+
+    def is_defeat(self) -> bool:
+        """True értékkel tér vissza, ha felfedésre került egy akna."""
+        return self.exploded_coords is not None
+
+    def toggle_flag(self, row_index, column_index) -> bool:
+        """A megadott, még fel nem fedett cellán elhelyez egy zászlót, ha még nem volt rajta, egyébként eltávolítja azt.
+        True értékkel tér vissza, ha a cellán a hívás után zászló van."""
+        self._check_indexes(row_index, column_index)
+        if self.is_revealed(row_index, column_index):
+            return False
+        flagged = not self.is_flagged(row_index, column_index)
+        self._set_state(self._flagged_chunks, row_index, column_index, flagged)
+        self.flagged_count += 1 if flagged else -1
+        return flagged
+
+    def reveal(self, row_index, column_index) -> dict[tuple[int, int], int]:
+        """Felfedi a megadott cellát és a hozzá kapcsolódó aknamentes területet (ld. MinesweeperModel.reveal()).
+        Egy felfedés legfeljebb max_cascade_cells cellát fed fel. Ha ennél nagyobb a terület, akkor a határán maradt
+        aknamentes szomszédságú cellák szomszédai fel nem fedettek maradnak. Egy ilyen, már felfedett aknamentes
+        szomszédságú cella újbóli kiválasztásával a felfedés tőle folytatódik.
+        """
+        self._check_indexes(row_index, column_index)
+        if self.exploded_coords is not None or self.is_flagged(row_index, column_index):
+            return {}
+        if self.is_revealed(row_index, column_index):
+            if self.number_of_mines_in_adjacent_cells(row_index, column_index):
+                return {}
+            return self._cascade(deque([(row_index, column_index)]), {})
+        if self.get_value(row_index, column_index):
+            self.exploded_coords = (row_index, column_index)
+            return {}
+        mine_counts = {(row_index, column_index): self.number_of_mines_in_adjacent_cells(row_index, column_index)}
+        self._set_state(self._revealed_chunks, row_index, column_index, True)
+        self.revealed_count += 1
+        return self._cascade(deque([] if mine_counts[row_index, column_index] else [(row_index, column_index)]), mine_counts)
+
+    def _cascade(self, queue: deque, mine_counts: dict) -> dict[tuple[int, int], int]:
+        # A queue aknamentes szomszédságú celláinak szomszédaitól kiinduló szélességi bejárás, amely a mine_counts
+        # szótárba gyűjtött felfedett cellák számát max_cascade_cells értékben korlátozza.
+        revealed_chunks, flagged_chunks = self._revealed_chunks, self._flagged_chunks
+        revealed_count = len(mine_counts)
+        while queue and len(mine_counts) < self.max_cascade_cells:
+            ri, ci = queue.popleft()
+            for coords in self.adjacent_cells_coords(ri, ci):
+                if self._get_state(revealed_chunks, *coords) or self._get_state(flagged_chunks, *coords):
+                    continue
+                mine_count = mine_counts[coords] = self.number_of_mines_in_adjacent_cells(*coords)
+                self._set_state(revealed_chunks, *coords, True)
+                if not mine_count:
+                    queue.append(coords)
+        self.revealed_count += len(mine_counts) - revealed_count
+        return mine_counts
+
+    def chord(self, row_index, column_index) -> dict[tuple[int, int], int]:
+        """A megadott felfedett számcella zászló nélküli szomszédainak felfedése egy lépésben, ha a szomszédos zászlók
+        száma megegyezik a szomszédos aknák számával (ld. MinesweeperModel.chord()). Aknamentes szomszédságú cella
+        esetén a max_cascade_cells korlát miatt félbemaradt felfedés folytatódik a cellától (ld. reveal())."""
+        if self.exploded_coords is not None or not self.is_revealed(row_index, column_index):
+            return {}
+        adjacent_coords = self.adjacent_cells_coords(row_index, column_index)
+        mine_count = self.number_of_mines_in_adjacent_cells(row_index, column_index)
+        if not mine_count:
+            return self.reveal(row_index, column_index)
+        if sum(self.is_flagged(*coords) for coords in adjacent_coords) != mine_count:
+            return {}
+        revealed_cells = {}
+        for coords in adjacent_coords:
+            revealed_cells.update(self.reveal(*coords))
+            if self.exploded_coords is not None:
+                break
+        return revealed_cells
+
+
+# TEST
+if __name__ == '__main__':
+    from time import perf_counter
+    model = EndlessMinesweeperModel(seed=1, max_cached_chunks=64)
+    model.generate_mines_randomly(safe_cell=(0, 0), safe_neighbours=True)
+    t0 = perf_counter()
+    print(len(model.reveal(0, 0)), 'felfedett cella')
+    # Egy hosszú, egyenes vonalú bejárás: a tárolt darabok száma korlátos marad.
+    for step in range(0, 100_000, 7):
+        model.number_of_mines_in_adjacent_cells(step, -step)
+    print(f'{perf_counter() - t0:.2f} s, előállított darabok: {model.generated_chunk_count}, '
+          f'tárolt darabok: {model.cached_chunk_count}')
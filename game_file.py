@@ -0,0 +1,148 @@
+import mmap
+import os
+import struct
+from argparse import ArgumentParser
+from time import monotonic
+from headless_game import HeadlessGame
+from minesweeper_model import MODEL_STORAGES, MinesweeperModel
+
+# A mentésfájl egy 64 bájtos fejlécből és az azt követő három bitsíkból (aknák, felfedett és zászlós cellák) áll
+# (ld. MinesweeperModel.get_bit_planes()). A fejléc mezői: azonosító, verzió, fenntartott mező, sor-, oszlop- és
+# aknaszám, a felfedett és a zászlós cellák száma, a felrobbant akna virtuális listaindexe (-1, ha nincs ilyen),
+# valamint az addig eltelt játékidő másodpercben.
+SAVE_MAGIC, SAVE_VERSION = b'MSWS', 1
+SAVE_HEADER = struct.Struct('<4sHHIIQQQqd8x')
+
+# A lépésnapló egy fejlécből és az azt követő, a lépések sorrendjében hozzáfűzött rekordokból áll. A fejléc mezői:
+# azonosító, verzió, jelzőbitek (0. bit: az első cella szomszédai is aknamentesek), sor-, oszlop- és aknaszám,
+# az aknaelrendezés seed értéke és a modell tárolási módja (ld. MODEL_STORAGES). Egy rekord a lépés ideje
+# a napló indításától másodpercben, a lépés fajtája, valamint a cella sor- és oszlopindexe.
+LOG_MAGIC, LOG_VERSION = b'MSWL', 1
+LOG_HEADER = struct.Struct('<4sHHIIQq8s')
+MOVE_RECORD = struct.Struct('<dB3xII')
+
+# A lépések fajtái: felfedés, zászló elhelyezése vagy eltávolítása, a szomszédok egy lépésben való felfedése.
+REVEAL, FLAG, CHORD = 0, 1, 2
+
+
+def save_game(model: MinesweeperModel, path, elapsed_time: float = 0.0):
+    """A modell aknaelrendezésének és cellaállapotainak mentése a megadott fájlba. A fájl egy ideiglenes fájlon
+    keresztül, egy lépésben cserélődik le, így megszakadt mentés esetén is ép marad a korábbi változat."""
+    exploded_index = -1 if model.exploded_coords is None else model.gridcoords_to_virtual_list_index(*model.exploded_coords)
+    header = SAVE_HEADER.pack(SAVE_MAGIC, SAVE_VERSION, 0, model.rowcount, model.columncount, model.minecount,
+                              model.revealed_count, model.flagged_count, exploded_index, elapsed_time)
+    temp_path = f'{path}.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        for plane in model.get_bit_planes():
+            f.write(plane)
+    os.replace(temp_path, path)
+
+
+def load_game(path, storage: str = 'bits') -> tuple[MinesweeperModel, float]:
+    """A save_game() függvénnyel mentett játék betöltése a megadott tárolási módú modellbe. A modellel és a mentéskor
+    eltelt játékidővel tér vissza.
+    A fájl a memóriába leképezve (mmap) kerül megnyitásra. A 'bits' tárolási mód esetén a modell bitsíkjai közvetlenül
+    a leképezett fájl részletei, így a betöltés a tábla méretétől függetlenül azonnali, és csak a ténylegesen olvasott
+    lapok kerülnek beolvasásra. A leképezés másolás íráskor (copy-on-write) típusú, a játék folytatása a fájlt nem módosítja.
+    """
+    with open(path, 'rb') as f:
+        file_size = os.fstat(f.fileno()).st_size
+        if file_size < SAVE_HEADER.size:
+            raise ValueError('A fájl nem aknakereső mentés.')
+        (magic, version, _, row_count, column_count, mine_count, revealed_count, flagged_count, exploded_index,
+         elapsed_time) = SAVE_HEADER.unpack(f.read(SAVE_HEADER.size))
+        if magic != SAVE_MAGIC:
+            raise ValueError('A fájl nem aknakereső mentés.')
+        if version != SAVE_VERSION:
+            raise ValueError(f'Nem támogatott mentésfájl verzió: {version}.')
+        # A fejléc adatait a modell létrehozása előtt a fájlmérettel vetjük össze, így egy sérült vagy hamis fejléc
+        # nem okozhat a táblamérettel arányos memóriafoglalást.
+        cell_count = row_count * column_count
+        size = (cell_count + 7) // 8
+        if row_count < 8 or column_count < 8 or not 0 < mine_count < cell_count:
+            raise ValueError('A mentésfájl fejlécében érvénytelen a táblaméret vagy az aknák száma.')
+        if file_size != SAVE_HEADER.size + 3 * size:
+            raise ValueError('A mentésfájl mérete nem egyezik a fejlécben megadott táblamérettel.')
+        if revealed_count > cell_count or flagged_count > cell_count or exploded_index >= cell_count:
+            raise ValueError('A mentésfájl fejlécében érvénytelenek a cellaállapotok számlálói.')
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    model = MinesweeperModel(row_count, column_count, mine_count, storage=storage)
+    view = memoryview(mapped)
+    model.set_bit_planes(*(view[SAVE_HEADER.size + i * size:SAVE_HEADER.size + (i + 1) * size] for i in range(3)))
+    model.revealed_count, model.flagged_count = revealed_count, flagged_count
+    model.exploded_coords = None if exploded_index < 0 else model.virtual_list_index_to_gridcoords(exploded_index)
+    return model, elapsed_time
+
+
+def storage_of(model: MinesweeperModel) -> str:
+    """A modell tárolási módjának neve (ld. MODEL_STORAGES)."""
+    for storage, model_class in MODEL_STORAGES.items():
+        if type(model) is model_class:
+            return storage
+    raise ValueError(f'Ismeretlen modellosztály: {type(model).__name__}.')
+
+
+class MoveLog:
+    """Egy játék lépéseinek (felfedések, zászlók, szomszédfelfedések) csak hozzáfűzéssel bővülő naplója.
+    A napló a játék kezdetén jön létre, és minden lépés után lemezre íródik, így egy megszakadt játék lépései is
+    visszajátszhatók. Az aknaelrendezést a naplóba írt seed érték és az első felfedett cella határozza meg,
+    ezért a naplózott játékban az aknákat ezzel a seed értékkel kell elhelyezni.
+    """
+
+    def __init__(self, path, model: MinesweeperModel, seed: int, safe_neighbours: bool = False):
+        self.file = open(path, 'wb')
+        self.file.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, int(safe_neighbours), model.rowcount, model.columncount,
+                                        model.minecount, seed, storage_of(model).encode()))
+        self.file.flush()
+        self.start_time = monotonic()  # A lépések ideje ehhez képest kerül a naplóba.
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def append(self, action: int, row_index: int, column_index: int):
+        """Egy lépés (REVEAL, FLAG vagy CHORD) hozzáfűzése a naplóhoz."""
+        self.file.write(MOVE_RECORD.pack(monotonic() - self.start_time, action, row_index, column_index))
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+def read_move_log(path) -> tuple[dict, list[tuple[float, int, int, int]]]:
+    """A MoveLog által írt napló beolvasása. A fejléc adatait tartalmazó szótárral és a lépések (idő, fajta, sorindex,
+    oszlopindex) listájával tér vissza. A napló végén levő, félbemaradt rekord figyelmen kívül marad."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < LOG_HEADER.size or data[:4] != LOG_MAGIC:
+        raise ValueError('A fájl nem aknakereső lépésnapló.')
+    _, version, flags, row_count, column_count, mine_count, seed, storage = LOG_HEADER.unpack_from(data)
+    if version != LOG_VERSION:
+        raise ValueError(f'Nem támogatott lépésnapló verzió: {version}.')
+    header = dict(rows=row_count, columns=column_count, mines=mine_count, seed=seed, safe_neighbours=bool(flags & 1),
+                  storage=storage.rstrip(b'\0').decode())
+    end = LOG_HEADER.size + (len(data) - LOG_HEADER.size) // MOVE_RECORD.size * MOVE_RECORD.size
+    return header, list(MOVE_RECORD.iter_unpack(data[LOG_HEADER.size:end]))
+
+
+def replay_headless(path) -> HeadlessGame:
+    """A lépésnapló visszajátszása grafikus felület nélkül, várakozás nélkül. A lejátszott játékkal tér vissza."""
+    header, moves = read_move_log(path)
+    model = MinesweeperModel(header['rows'], header['columns'], header['mines'], storage=header['storage'])
+    game = HeadlessGame(model, safe_neighbours=header['safe_neighbours'], seed=header['seed'])
+    actions = {REVEAL: game.reveal, FLAG: game.toggle_flag, CHORD: game.chord}
+    for _, action, row_index, column_index in moves:
+        actions[action](row_index, column_index)
+    return game
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Aknakereső lépésnapló visszajátszása grafikus felület nélkül.')
+    parser.add_argument('log')
+    args = parser.parse_args()
+    game = replay_headless(args.log)
+    print(game)
+    print(f'állapot: {game.state}, felfedő lépések: {game.clicks}, felfedett cellák: {game.model.revealed_count}')
@@ -0,0 +1,287 @@
+import asyncio
+from argparse import ArgumentParser
+from concurrent.futures import Executor
+from itertools import count
+from time import monotonic
+from headless_game import HeadlessGame
+from minesweeper_model import MinesweeperModel
+
+# A szerver egy soronkénti, szöveges protokollt beszél. Egy kérés egy sor, amely a parancsból és szóközzel elválasztott
+# egész számú argumentumaiból áll, és a szerver minden kérésre egyetlen sorral válaszol. A parancsok:
+#   NEW <sorok> <oszlopok> [<aknák> [<seed>]]  -> OK <játékazonosító>
+#   REVEAL <azonosító> <sor> <oszlop>          -> OK <állapot> <n> <cella> ...
+#   CHORD <azonosító> <sor> <oszlop>           -> OK <állapot> <n> <cella> ...
+#   FLAG <azonosító> <sor> <oszlop>            -> OK <állapot> <n> <cella> ...
+#   STATE <azonosító>                          -> OK <állapot> <sorok> <oszlopok> <aknák> <felfedett> <zászlós> <lépések>
+#   CLOSE <azonosító>                          -> OK
+# A lépések válasza csak a lépés által megváltoztatott n cellát tartalmazza <sor>,<oszlop>,<érték> alakban, ahol az
+# érték a szomszédos aknák száma, 'F' (zászló), '.' (zászló eltávolítva) vagy '*' (felrobbant akna). Az állapot
+# a HeadlessGame állapota (ready, playing, won, lost). Hibás kérés esetén a válasz: ERR <üzenet>. A sorok kódolása UTF-8.
+
+# A protokoll parancsai és argumentumaik legkisebb és legnagyobb száma.
+COMMANDS = {'NEW': (2, 4), 'REVEAL': (3, 3), 'CHORD': (3, 3), 'FLAG': (3, 3), 'STATE': (1, 1), 'CLOSE': (1, 1)}
+
+
+class GameServerError(Exception):
+    """A szerver által ERR válasszal elutasított kérés hibája a kliens oldalon."""
+
+
+class Session:
+    """Egy, a szerveren futó játék és a hozzá tartozó adatok. A lock biztosítja, hogy egy játék lépései akkor is
+    sorban hajtódjanak végre, ha a végrehajtásuk egy része a végrehajtóban (executor) történik."""
+
+    __slots__ = ('game', 'lock', 'last_used')
+
+    def __init__(self, game: HeadlessGame):
+        self.game = game
+        self.lock = asyncio.Lock()
+        self.last_used = monotonic()
+
+
+class GameServer:
+    """Sok, egyidejűleg futó aknakereső játékot grafikus felület nélkül kiszolgáló asyncio TCP szerver
+    (ld. a protokoll leírását a modul elején). A játékok a HeadlessGame osztállyal, bitenként tömörített
+    ('bits' tárolási módú) modellel futnak, így egy játék memóriaigénye cellánként néhány bit, és a max_cells
+    legnagyobb cellaszám miatt korlátos. A játékok száma legfeljebb max_sessions lehet, és az idle_timeout
+    másodpercnél régebben használt játékok automatikusan törlésre kerülnek.
+    A modell létrehozása és az aknák elhelyezése (az első felfedés), valamint az executor_cells cellánál nagyobb
+    táblák lépései a végrehajtóban (alapértelmezés szerint az eseményhurok szálkészletében) futnak, így egy nagy
+    tábla előállítása nem akasztja meg a többi játék kiszolgálását.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8765, max_sessions: int = 10_000, max_cells: int = 250_000,
+                 idle_timeout: float = 300.0, executor_cells: int = 100_000, executor: Executor | None = None):
+        self.host, self.port = host, port
+        self.max_sessions = max_sessions
+        self.max_cells = max_cells
+        self.idle_timeout = idle_timeout
+        self.executor_cells = executor_cells
+        self.executor = executor  # None esetén az eseményhurok alapértelmezett végrehajtója.
+        self.sessions: dict[int, Session] = {}  # A futó játékok az azonosítóik szerint.
+        self._session_ids = count(1)
+        self._reserved_sessions = 0  # A létrehozás alatt álló (a végrehajtóra váró) játékok száma.
+        self._server = None
+        self._reaper = None  # A régóta nem használt játékokat törlő feladat.
+
+    async def start(self):
+        """A szerver indítása. A tényleges portszámot (0 megadása esetén a rendszer által választottat)
+        a port attribútum tartalmazza."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._reaper = asyncio.create_task(self._expire_idle_sessions())
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """A szerver leállítása és a játékok törlése."""
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self.sessions.clear()
+
+    async def _expire_idle_sessions(self):
+        while True:
+            await asyncio.sleep(self.idle_timeout / 2)
+            deadline = monotonic() - self.idle_timeout
+            for session_id in [sid for sid, session in self.sessions.items() if session.last_used < deadline]:
+                del self.sessions[session_id]
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Egy kapcsolat kéréseinek sorban történő kiszolgálása a kapcsolat lezárásáig."""
+        try:
+            while line := await reader.readline():
+                writer.write((await self.handle_request(line.decode('utf-8', 'replace')) + '\n').encode('utf-8'))
+                await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle_request(self, line: str) -> str:
+        """Egy kérés végrehajtása és a válaszsor (sorvége jel nélkül) előállítása."""
+        command, *args = line.split() or ['']
+        command = command.upper()
+        if command not in COMMANDS:
+            return f'ERR ismeretlen parancs: {command}'
+        min_args, max_args = COMMANDS[command]
+        if not min_args <= len(args) <= max_args:
+            return f'ERR hibás argumentumszám: {command}'
+        try:
+            args = [int(arg) for arg in args]
+        except ValueError:
+            return 'ERR az argumentumok egész számok kell, hogy legyenek'
+        try:
+            if command == 'NEW':
+                return f'OK {await self.new_game(*args)}'
+            session = self._session(args[0])
+            async with session.lock:
+                if command == 'CLOSE':
+                    self.sessions.pop(args[0], None)
+                    return 'OK'
+                if command == 'STATE':
+                    return f'OK {self._state(session.game)}'
+                return f'OK {await self._move(session.game, command, *args[1:])}'
+        except (ValueError, LookupError, TypeError) as exc:
+            return f'ERR {exc}'
+
+    def _session(self, session_id) -> Session:
+        if (session := self.sessions.get(session_id)) is None:
+            raise LookupError(f'nincs {session_id} azonosítójú játék')
+        session.last_used = monotonic()
+        return session
+
+    async def new_game(self, row_count, column_count, mine_count=None, seed=None) -> int:
+        """Új játék létrehozása. Az azonosítójával tér vissza."""
+        # A létrehozás alatt álló játékok is foglalnak helyet, különben az egyidejű kérések mind átjutnának
+        # az ellenőrzésen, mielőtt bármelyik játék bekerülne a sessions szótárba.
+        if len(self.sessions) + self._reserved_sessions >= self.max_sessions:
+            raise ValueError('a játékok száma elérte a megengedett legnagyobbat')
+        if row_count * column_count > self.max_cells:
+            raise ValueError(f'a tábla legfeljebb {self.max_cells} cellás lehet')
+        loop = asyncio.get_running_loop()
+        self._reserved_sessions += 1
+        try:
+            model = await loop.run_in_executor(self.executor, lambda: MinesweeperModel(row_count, column_count,
+                                                                                       mine_count, storage='bits'))
+        finally:
+            self._reserved_sessions -= 1
+        session_id = next(self._session_ids)
+        self.sessions[session_id] = Session(HeadlessGame(model, seed=seed))
+        return session_id
+
+    async def _move(self, game: HeadlessGame, command, row_index, column_index) -> str:
+        """Egy lépés végrehajtása és a megváltozott cellák válaszbeli leírása."""
+        game.model._check_indexes(row_index, column_index)
+        if command == 'FLAG':
+            was_flagged = game.model.is_flagged(row_index, column_index)
+            if game.model.is_revealed(row_index, column_index) or game.toggle_flag(row_index, column_index) == was_flagged:
+                return f'{game.state} 0'
+            return f'{game.state} 1 {row_index},{column_index},{"." if was_flagged else "F"}'
+        move = game.reveal if command == 'REVEAL' else game.chord
+        was_defeat = game.model.is_defeat()
+        if not game.is_started or len(game.model) > self.executor_cells:
+            changed_cells = await asyncio.get_running_loop().run_in_executor(self.executor, move, row_index, column_index)
+        else:
+            changed_cells = move(row_index, column_index)
+        cells = [f'{ri},{ci},{mine_count}' for (ri, ci), mine_count in changed_cells.items()]
+        # A felrobbant akna csak abban a lépésben kerül a válaszba, amelyikben a robbanás történt.
+        if game.model.is_defeat() and not was_defeat:
+            cells.append('{},{},*'.format(*game.model.exploded_coords))
+        return f'{game.state} {len(cells)} {" ".join(cells)}'.rstrip()
+
+    @staticmethod
+    def _state(game: HeadlessGame) -> str:
+        model = game.model
+        return (f'{game.state} {model.rowcount} {model.columncount} {model.minecount} {model.revealed_count} '
+                f'{model.flagged_count} {game.clicks}')
+
+
+def parse_cells(tokens: list[str]) -> dict[tuple[int, int], int | str]:
+    """A lépések válaszában kapott cellaleírások szótárrá alakítása a cellák rácskoordinátái szerint."""
+    cells = {}
+    for token in tokens:
+        ri, ci, value = token.split(',')
+        cells[int(ri), int(ci)] = int(value) if value.isdigit() else value
+    return cells
+
+
+class GameClient:
+    """A GameServer egyszerű asyncio kliense (pl. játékos programokhoz és teszteléshez)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader, self.writer = reader, writer
+
+    @classmethod
+    async def connect(cls, host: str = '127.0.0.1', port: int = 8765, limit: int = 2 ** 24) -> 'GameClient':
+        # A limit a válaszsor legnagyobb hossza bájtban. Egy nagy táblán egy felfedés sok cellát érinthet, ezért
+        # az alapértelmezés a szerver max_cells korlátjához tartozó leghosszabb válasznál is nagyobb.
+        return cls(*await asyncio.open_connection(host, port, limit=limit))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def request(self, *args) -> list[str]:
+        """Egy kérés elküldése. A válasz OK utáni elemeivel tér vissza, ERR válasz esetén GameServerError kivételt dob."""
+        self.writer.write((' '.join(map(str, args)) + '\n').encode('utf-8'))
+        await self.writer.drain()
+        status, *tokens = (await self.reader.readline()).decode('utf-8').split(' ', 1)
+        if status.strip() != 'OK':
+            raise GameServerError(''.join(tokens).strip())
+        return tokens[0].split() if tokens else []
+
+    async def new_game(self, row_count, column_count, mine_count=None, seed=None) -> int:
+        args = [arg for arg in (mine_count, seed) if arg is not None]
+        if mine_count is None and seed is not None:
+            raise ValueError('A seed csak az aknaszámmal együtt adható meg.')
+        return int((await self.request('NEW', row_count, column_count, *args))[0])
+
+    async def move(self, command: str, game_id, row_index, column_index) -> tuple[str, dict[tuple[int, int], int | str]]:
+        """Egy lépés (REVEAL, CHORD vagy FLAG) végrehajtása. A játék állapotával és a megváltozott cellákkal tér vissza."""
+        state, _, *cells = await self.request(command, game_id, row_index, column_index)
+        return state, parse_cells(cells)
+
+    async def reveal(self, game_id, row_index, column_index):
+        return await self.move('REVEAL', game_id, row_index, column_index)
+
+    async def chord(self, game_id, row_index, column_index):
+        return await self.move('CHORD', game_id, row_index, column_index)
+
+    async def toggle_flag(self, game_id, row_index, column_index):
+        return await self.move('FLAG', game_id, row_index, column_index)
+
+    async def state(self, game_id) -> dict:
+        state, *numbers = await self.request('STATE', game_id)
+        keys = ('rows', 'columns', 'mines', 'revealed', 'flagged', 'clicks')
+        return {'state': state, **dict(zip(keys, map(int, numbers)))}
+
+    async def close_game(self, game_id):
+        await self.request('CLOSE', game_id)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+
+async def _demo(games: int):
+    # TEST: a szerver indítása egy szabad porton, és games számú játék párhuzamos lejátszása véletlen lépésekkel.
+    from random import Random
+    server = GameServer(port=0)
+    await server.start()
+
+    async def play(i):
+        rng = Random(i)
+        async with await GameClient.connect(port=server.port) as client:
+            game_id = await client.new_game(16, 16, 40, i)
+            state = 'ready'
+            while state in ('ready', 'playing'):
+                state, _ = await client.reveal(game_id, rng.randrange(16), rng.randrange(16))
+            return state
+
+    t0 = monotonic()
+    results = await asyncio.gather(*(play(i) for i in range(games)))
+    print(f'{games} játék {monotonic() - t0:.2f} s alatt, nyert: {results.count("won")}, vesztett: {results.count("lost")}')
+    await server.close()
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Aknakereső játékszerver grafikus felület nélküli, programokkal játszott játékokhoz.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-sessions', type=int, default=10_000)
+    parser.add_argument('--max-cells', type=int, default=250_000)
+    parser.add_argument('--idle-timeout', type=float, default=300.0)
+    parser.add_argument('--demo', type=int, metavar='GAMES', help='a szerver helyett a megadott számú játék lejátszása')
+    args = parser.parse_args()
+    if args.demo:
+        asyncio.run(_demo(args.demo))
+    else:
+        asyncio.run(GameServer(args.host, args.port, args.max_sessions, args.max_cells, args.idle_timeout).serve_forever())
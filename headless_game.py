@@ -0,0 +1,97 @@
+from minesweeper_model import MinesweeperModel
+
+
+class HeadlessGame:
+    """Az aknakereső játék menetét grafikus felület (tkinter) nélkül vezérlő osztály a MinesweeperModel felett.
+    A cellák felfedése, a zászlók elhelyezése és a játék állapotának lekérdezése metódushívásokkal történik, így
+    a játékot programok (pl. szimulációk, játékos algoritmusok) is játszhatják. A cellák állapotát a modell tárolja.
+    """
+
+    # A játék lehetséges állapotai.
+    READY, PLAYING, WON, LOST = 'ready', 'playing', 'won', 'lost'
+
+    def __init__(self, model: MinesweeperModel, safe_neighbours: bool = False, seed: int | None = None):
+        self.model = model
+        self.model.reset_state()
+        self.safe_neighbours = safe_neighbours  # Ha igaz, akkor az első felfedett cella szomszédaira sem kerül akna.
+        self.seed = seed  # Az aknaelrendezés véletlenszám-generátorának kezdőértéke.
+        self.is_started = False  # Az első felfedéskor (az aknák elhelyezésekor) válik igazzá.
+        self.clicks = 0  # A felfedő lépések száma.
+        self.last_revealed_cells = {}  # A legutóbbi felfedő lépésben felfedett cellák szomszédos aknaszámai.
+
+    @property
+    def state(self) -> str:
+        """A játék állapota: READY, PLAYING, WON vagy LOST."""
+        if not self.is_started:
+            return self.READY
+        if self.model.is_defeat():
+            return self.LOST
+        return self.WON if self.model.is_victory() else self.PLAYING
+
+    @property
+    def is_over(self) -> bool:
+        """True értékkel tér vissza, ha a játék győzelemmel vagy vereséggel véget ért."""
+        return self.state in (self.WON, self.LOST)
+
+    def reveal(self, row_index, column_index) -> dict[tuple[int, int], int]:
+        """Felfedi a megadott cellát, és ha annak szomszédságában nincs akna, akkor a GameField-del azonos módon az
+        összes összefüggő, aknamentes területet. Az újonnan felfedett cellák szomszédos aknaszámait a rácskoordinátáik
+        szerint egy szótárban adja vissza. Aknára lépéskor, illetve befejezett játék vagy zászlós cella esetén
+        üres szótárral tér vissza.
+        """
+        self.last_revealed_cells = {}
+        if self.is_over or self.model.is_flagged(row_index, column_index):
+            return {}
+        if not self.is_started:
+            # Az aknák az első felfedéskor kerülnek elhelyezésre úgy, hogy a felfedett cellán ne legyen akna.
+            self.model.generate_mines_randomly(safe_cell=(row_index, column_index), safe_neighbours=self.safe_neighbours,
+                                               seed=self.seed)
+            self.is_started = True
+        self.clicks += 1
+        self.last_revealed_cells = self.model.reveal(row_index, column_index)
+        return self.last_revealed_cells
+
+    def chord(self, row_index, column_index) -> dict[tuple[int, int], int]:
+        """A megadott felfedett számcella zászló nélküli szomszédainak felfedése egy lépésben, ha a szomszédos zászlók
+        száma megegyezik a szomszédos aknák számával (ld. MinesweeperModel.chord())."""
+        self.last_revealed_cells = {}
+        if self.is_over or not self.is_started:
+            return {}
+        self.clicks += 1
+        self.last_revealed_cells = self.model.chord(row_index, column_index)
+        return self.last_revealed_cells
+
+    def toggle_flag(self, row_index, column_index) -> bool:
+        """A megadott, még fel nem fedett cellán elhelyez egy zászlót, ha még nem volt rajta, egyébként eltávolítja azt.
+        True értékkel tér vissza, ha a cellán a hívás után zászló van."""
+        if self.is_over:
+            return self.model.is_flagged(row_index, column_index)
+        return self.model.toggle_flag(row_index, column_index)
+
+    def get_cell_state(self, row_index, column_index) -> int | str:
+        """A megadott cella játékos számára látható állapotával tér vissza: felfedett cella esetén a szomszédos aknák
+        számával, egyébként az 'F' (zászlós), a '*' (felrobbant akna) vagy a '.' (fel nem fedett) karakterrel."""
+        cell_state = self.model.cell_state(row_index, column_index)
+        if cell_state == self.model.REVEALED:
+            return self.model.number_of_mines_in_adjacent_cells(row_index, column_index)
+        return {self.model.FLAGGED: 'F', self.model.EXPLODED: '*'}.get(cell_state, '.')
+
+    def __str__(self):
+        return '\n'.join(' '.join(str(self.get_cell_state(ri, ci)) for ci in range(self.model.columncount))
+                         for ri in range(self.model.rowcount))
+
+
+def count_3bv(model: MinesweeperModel) -> int:
+    """Visszaadja az aknaelrendezés 3BV értékét, vagyis a tábla megoldásához minimálisan szükséges kattintások számát:
+    az aknamentes szomszédságú cellákból álló összefüggő területek (nyitások) és az ezekkel nem szomszédos,
+    aknát nem tartalmazó cellák együttes számát.
+    """
+    covered_coords = set()  # A nyitások által felfedett cellák koordinátái.
+    openings = 0
+    for index in range(len(model)):
+        coords = model.virtual_list_index_to_gridcoords(index)
+        if coords in covered_coords or model.get_value(*coords) or model._adjacent_mine_count_at(index):
+            continue
+        covered_coords.update(model.reveal_safe_cells(*coords, covered_coords))
+        openings += 1
+    return openings + len(model) - model.minecount - len(covered_coords)
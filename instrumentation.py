@@ -0,0 +1,206 @@
+import atexit
+import csv
+import json
+import tkinter as tk
+import tracemalloc
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+
+# A mérőpont leírása: (osztály, metódusnév, delta, állapot), ahol a delta és az állapot egy-egy, a metódus első
+# argumentumát (self) váró és {mérőszám neve: érték} szótárt visszaadó függvény vagy None. A delta mérőszámainak
+# a hívás előtti és utáni különbsége, az állapot mérőszámainak a hívás utáni értéke kerül rögzítésre.
+Probe = tuple[type, str, Callable[[object], dict] | None, Callable[[object], dict] | None]
+
+
+class Histogram:
+    """Értékek eloszlását kettő hatványai szerinti (logaritmikus) vödrökben tároló hisztogram. A vödrök száma az
+    értéktartománytól logaritmikusan függ, így a memóriaigény a rögzített értékek számától független.
+    Az értékek a scale szorzóval egész egységekre váltva kerülnek a vödrökbe (pl. másodpercből mikroszekundumba)."""
+
+    def __init__(self, unit: str = '', scale: float = 1):
+        self.unit, self.scale = unit, scale
+        self.buckets = {}  # A vödrök felső határa (egységben) és a beléjük eső értékek száma.
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        self.min, self.max = min(self.min, value), max(self.max, value)
+        upper_bound = 1 << max(int(value * self.scale), 0).bit_length()
+        self.buckets[upper_bound] = self.buckets.get(upper_bound, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """A q (0..1) kvantilis becslése a vödrök felső határával, a rögzített értékek eredeti mértékegységében."""
+        rank, seen = q * self.count, 0
+        for upper_bound in sorted(self.buckets):
+            seen += self.buckets[upper_bound]
+            if seen >= rank:
+                return min(upper_bound / self.scale, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """A hisztogram összesítő adatai és vödrei."""
+        if not self.count:
+            return {'unit': self.unit, 'count': 0}
+        return {'unit': self.unit, 'count': self.count, 'total': self.total, 'mean': self.total / self.count,
+                'min': self.min, 'max': self.max, 'p50': self.percentile(0.5), 'p90': self.percentile(0.9),
+                'p99': self.percentile(0.99), 'buckets': {str(k): v for k, v in sorted(self.buckets.items())}}
+
+
+class Instrumentation:
+    """A kiválasztott metódusok futásidejét, a megadott mérőszámokat és a hívások alatti memóriafoglalást rögzítő
+    mérőréteg. Bekapcsoláskor a mérőpontok metódusait mérő burkolófüggvényekre cseréli az osztályokban,
+    kikapcsoláskor visszaállítja az eredetieket, így kikapcsolt állapotban semmilyen többletköltsége nincs.
+    Az eseménykezelők a hozzárendeléskor kerülnek átvételre, ezért a mérést a játékmező létrehozása előtt kell
+    bekapcsolni.
+    """
+
+    def __init__(self):
+        self.histograms: dict[str, Histogram] = {}
+        self.is_enabled = False
+        self.trace_allocations = False
+        self._originals = []  # A lecserélt metódusok: (osztály, név, eredeti függvény).
+        self._depth = 0  # Az éppen futó, mért hívások egymásba ágyazási mélysége.
+
+    def histogram(self, name: str, unit: str = '', scale: float = 1) -> Histogram:
+        """A megadott nevű hisztogram, ami szükség esetén létrejön."""
+        if name not in self.histograms:
+            self.histograms[name] = Histogram(unit, scale)
+        return self.histograms[name]
+
+    def enable(self, probes: list[Probe], export_path: str | None = None, trace_allocations: bool = False):
+        """A mérés bekapcsolása a megadott mérőpontokra. Ha az export_path meg van adva, akkor a program kilépésekor
+        az eredmények ebbe a fájlba kerülnek (ld. export()). A trace_allocations igaz értéke esetén a hívások alatti
+        memóriafoglalás is mérésre kerül a tracemalloc modullal."""
+        if self.is_enabled:
+            self.disable()
+        self.is_enabled = True
+        self.trace_allocations = trace_allocations
+        if trace_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        for cls, name, delta, state in probes:
+            original = cls.__dict__[name]
+            self._originals.append((cls, name, original))
+            setattr(cls, name, self._wrap(f'{cls.__name__}.{name}', original, delta, state))
+        if export_path is not None:
+            atexit.register(self.export, export_path)
+
+    def disable(self):
+        """A mérés kikapcsolása és az eredeti metódusok visszaállítása. A rögzített adatok megmaradnak."""
+        for cls, name, original in reversed(self._originals):
+            setattr(cls, name, original)
+        self._originals.clear()
+        if self.trace_allocations and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.is_enabled = False
+
+    def _wrap(self, name: str, func: Callable, delta, state) -> Callable:
+        """A func futásidejét, valamint a mérőpont mérőszámait és a memóriafoglalást rögzítő burkolófüggvény."""
+        latency = self.histogram(f'{name}.latency', 's', 1e6)
+        trace_allocations = self.trace_allocations
+
+        @wraps(func)
+        def wrapper(obj, *args, **kwargs):
+            before = delta(obj) if delta is not None else None
+            # A csúcsfoglalás csak a legkülső mért hívásra mérhető, a belső hívások nullázása ezt elrontaná.
+            is_outermost = self._depth == 0
+            if trace_allocations:
+                if is_outermost:
+                    tracemalloc.reset_peak()
+                allocated_before = tracemalloc.get_traced_memory()[0]
+            self._depth += 1
+            t0 = perf_counter()
+            try:
+                return func(obj, *args, **kwargs)
+            finally:
+                latency.add(perf_counter() - t0)
+                self._depth -= 1
+                if trace_allocations:
+                    current, peak = tracemalloc.get_traced_memory()
+                    if is_outermost:
+                        self.histogram(f'{name}.allocated', 'B').add(peak - allocated_before)
+                    self.histogram(f'{name}.retained', 'B').add(current - allocated_before)
+                if before is not None:
+                    for key, value in delta(obj).items():
+                        self.histogram(f'{name}.{key}').add(value - before[key])
+                if state is not None:
+                    for key, value in state(obj).items():
+                        self.histogram(f'{name}.{key}').add(value)
+
+        return wrapper
+
+    def report(self) -> dict[str, dict]:
+        """Az összes hisztogram összesítő adatai a nevük szerint."""
+        return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export(self, path: str):
+        """Az eredmények mentése a fájlnév kiterjesztésétől függően CSV (.csv) vagy JSON formátumban."""
+        report = self.report()
+        if str(path).endswith('.csv'):
+            fields = ['name', 'unit', 'count', 'total', 'mean', 'min', 'max', 'p50', 'p90', 'p99']
+            with open(path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fields, extrasaction='ignore')
+                writer.writeheader()
+                for name, summary in report.items():
+                    writer.writerow({'name': name, **summary})
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+
+    def overlay_text(self) -> str:
+        """A mérési eredmények rövid, soronkénti szöveges összefoglalása a képernyőn megjelenítéshez."""
+        lines = []
+        for name, summary in self.report().items():
+            if not summary['count']:
+                continue
+            if summary['unit'] == 's':
+                lines.append(f'{name}: n={summary["count"]} p50={summary["p50"] * 1000:.2f} ms '
+                             f'p99={summary["p99"] * 1000:.2f} ms max={summary["max"] * 1000:.2f} ms')
+            else:
+                unit = f' {summary["unit"]}' if summary['unit'] else ''
+                lines.append(f'{name}: n={summary["count"]} átlag={summary["mean"]:.0f}{unit} max={summary["max"]:.0f}{unit} '
+                             f'összesen={summary["total"]:.0f}{unit}')
+        return '\n'.join(lines) or 'Még nincs mérési adat.'
+
+
+# A program által használt, közös mérőréteg.
+profiler = Instrumentation()
+
+
+def widget_counts(widget: tk.Misc) -> dict[str, int]:
+    """A widget és a leszármazottai száma, valamint a köztük levő Canvas példányok rajzelemeinek száma."""
+    widgets, i = [widget], 0
+    while i < len(widgets):
+        widgets.extend(widgets[i].winfo_children())
+        i += 1
+    return {'widgets': len(widgets), 'canvas_items': sum(len(w.find_all()) for w in widgets if isinstance(w, tk.Canvas))}
+
+
+class DebugOverlay(tk.Label):
+    """A mérési eredményeket a főablak jobb felső sarkában, a többi grafikus elem fölött megjelenítő, rendszeresen
+    frissülő címke. A toggle() metódussal jeleníthető meg és rejthető el."""
+
+    refresh_interval = 500  # A frissítés időköze ms-ban.
+
+    def __init__(self, master: tk.Misc, instrumentation: Instrumentation = profiler):
+        super().__init__(master, justify=tk.LEFT, anchor='nw', bg='black', fg='lime', font=('Courier', 9))
+        self.instrumentation = instrumentation
+        self.id = None
+
+    def toggle(self):
+        if self.id is None:
+            self.place(relx=1, x=-4, y=4, anchor='ne')
+            self._refresh()
+        else:
+            self.after_cancel(self.id)
+            self.id = None
+            self.place_forget()
+
+    def _refresh(self):
+        self.config(text=self.instrumentation.overlay_text())
+        self.lift()
+        self.id = self.after(self.refresh_interval, self._refresh)
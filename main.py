@@ -2,9 +2,18 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter.simpledialog import askstring
 from tkinter.messagebox import showinfo, showerror
+from tkinter.filedialog import askopenfilename, asksaveasfilename
 from itertools import product
-from minesweeper_model import MinesweeperModel
+from random import getrandbits
+import os
+import game_file
+from endless_model import EndlessMinesweeperModel
+from instrumentation import DebugOverlay, profiler, widget_counts
+from minesweeper_model import MODEL_STORAGES, MinesweeperModel
+from no_guess import DEFAULT_POOL_PATH, BoardSearch, NoGuessBoardPool, start_cell
+from solver import MinesweeperSolver
 from stop_watch import StopWatch
+from update_scheduler import UpdateScheduler
 
 
 class ControlPanel(tk.Frame):
@@ -25,8 +34,63 @@ class ControlPanel(tk.Frame):
         self.grid_columnconfigure(1, weight=1)
 
 
+class BoardSearchDialog(tk.Toplevel):
+    """A találgatás nélkül megoldható tábla keresése alatt megjelenő modális ablak. A keresést rendszeres időközönként
+    továbbviszi (ld. BoardSearch.poll()), a MÉGSE gombbal pedig a keresés megszakítható. A keresés végén az on_done
+    függvényt hívja a talált tábla seed értékével, vagy None értékkel, ha a keresés megszakadt vagy sikertelen volt."""
+
+    poll_interval = 100  # A keresés állapotának vizsgálati időköze ms-ban.
+
+    def __init__(self, master: MineSweeper, search: BoardSearch, on_done):
+        super().__init__(master)
+        self.search, self.on_done = search, on_done
+        self.title('Táblakeresés')
+        self.resizable(False, False)
+        self.transient(master)
+        common_options = dict(font=('Helvetica', 12, 'bold'))
+        tk.Label(self, text='Találgatás nélkül megoldható tábla keresése...', padx=20, pady=10, **common_options).pack()
+        tk.Button(self, text='MÉGSE', command=self.cancel, **common_options).pack(pady=(0, 10))
+        self.protocol('WM_DELETE_WINDOW', self.cancel)
+        # A keresés alatt a főablak nem fogad eseményeket.
+        self.grab_set()
+        self.id = self.after(self.poll_interval, self._poll)
+
+    def _poll(self):
+        try:
+            seed = self.search.poll()
+        except RuntimeError as exc:
+            self._finish()
+            showerror('táblakészítési hiba'.upper(), 'Nem található találgatás nélkül megoldható tábla.', detail=exc)
+            self.on_done(None)
+            return
+        if seed is None:
+            self.id = self.after(self.poll_interval, self._poll)
+        else:
+            self._finish()
+            self.on_done(seed)
+
+    def cancel(self):
+        """A keresés megszakítása."""
+        self.after_cancel(self.id)
+        self.search.cancel()
+        self._finish()
+        self.on_done(None)
+
+    def _finish(self):
+        self.grab_release()
+        self.destroy()
+
+
 class GameField(tk.Frame):
-    def __init__(self, master: MineSweeper, **options):
+    """A játékmező, amelyen minden cellát egy-egy önálló Canvas példány jelenít meg."""
+
+    # Ha igaz, akkor az első kiválasztott cella szomszédaira sem kerül akna.
+    safe_first_neighbours = False
+
+    def __init__(self, master: MineSweeper, seed: int | None = None, restore_state: bool = False, **options):
+        # A seed az aknaelrendezés véletlenszám-generátorának kezdőértéke, megadása nélkül véletlenszerű. Ha a
+        # restore_state igaz, akkor a modell cellaállapotai (pl. egy betöltött mentésé) megmaradnak, ezek
+        # a játékmező lehelyezése után a show_model_state() metódussal jeleníthetők meg.
         super().__init__(master, **options)
         self.master: MineSweeper = master
         # Az időmérő működésre kész induló állapotba hozása.
@@ -38,14 +102,35 @@ class GameField(tk.Frame):
         self.cell_size = self.master.cell_size
         self.flag_counter = self.master.flag_counter
         # Az egyéb szükséges példányattribútumok.
-        self.current_widget = None  # Az aktuálisan kiválasztott cella widget-je.
+        self.seed = getrandbits(63) if seed is None else seed
         self.is_first_cell = True
-        self.visited_coords = set()  # A már felfedezett (meglátogatott) cellák koordinátái.
+        self.is_game_over = False
+        # A cellák állapotát (felfedett, zászlós) a modell tartja nyilván, új játéknál ezt alaphelyzetbe hozzuk.
+        if not restore_state:
+            self.model.reset_state()
+        # A felfedett cellák alapján a biztosan aknamentes cellákat megtaláló, tippeket adó megoldó. A megoldó csak
+        # tippkéréskor kapja meg a közben felfedett, számot mutató cellákat (ld. _update_solver()).
+        self.solver = MinesweeperSolver(self.model)
+        self.unsolved_cells = {}
+        # A cellák megjelenítésének változásai egy eseménykezelés végén, egy menetben kerülnek végrehajtásra.
+        self.updates = UpdateScheduler(self)
         # Egy adott cella szomszédságában levő aknák számát jelző számjegyek színei.
         self.num_colors = {1: 'blue', 2: 'green', 3: 'red', 4: 'salmon', 5: 'orange', 6: 'brown', 7: 'black', 8: 'gray'}
         # Új játék indításához az előző tábla grafikus elemeit eltávolítjuk, ha voltak ilyenek.
         for widget in self.winfo_children():
             widget.destroy()
+        # A cellák grafikus elemeinek létrehozása.
+        self._create_cells()
+        # Az aknaszám mint kezdőérték kiírása a zászlószámlálón. Az aknák az első cella kiválasztásakor kerülnek elhelyezésre.
+        self._update_flag_counter()
+        # A lépésnapló, ha a lépések naplózása be van kapcsolva (ld. _log_move()). Egy betöltött mentés aknaelrendezését
+        # nem a játékmező seed értéke határozza meg, így annak lépései a naplóból nem volnának visszajátszhatók.
+        self.move_log = None
+        self.logs_moves = not restore_state
+
+    def _create_cells(self):
+        """A cellák számának megfelelő mennyiségű Canvas példány létrehozása és lehelyezése."""
+        self.cells = {}  # A cellák Canvas példányai a rácskoordinátáik szerint.
         # A cellák számának megfelelő mennyiségű Canvas példány létrehozása a meghatározott méretű négyzet alakban.
         canvas_configs = dict(bd=6, relief=tk.RAISED, highlightthickness=0)
         canvases = (tk.Canvas(self, width=self.cell_size, height=self.cell_size, **canvas_configs)
@@ -55,14 +140,17 @@ class GameField(tk.Frame):
         for cnv, grid_coords in zip(canvases, product(range(self.rowcount), range(self.columncount))):
             ri, ci = grid_coords
             cnv.grid(row=ri, column=ci, sticky='news')
+            self.cells[grid_coords] = cnv
             cnv.bind('<Button 1>', self._on_cell_left_click)
             cnv.bind('<Button 3>', self._on_cell_right_click)
         # A táblázat sorai és oszlopai minimális méretének beállítása az aktuális cellaméret és a Canvas példány szegélyvastagsága alapján.
         self.grid_rowconfigure('all', minsize=self.cell_size + float(2 * canvas_configs.get('bd')))
         self.grid_columnconfigure('all', minsize=self.cell_size + float(2 * canvas_configs.get('bd')))
-        # Az adott számú akna véletlenszerű elhelyezése a cellákban, és az aknaszám mint kezdőérték kiírása a zászlószámlálón.
-        self.model.generate_mines_randomly()
-        self.flag_counter.set(self.model.minecount)
+
+    def _event_to_gridcoords(self, event) -> tuple[int, int] | None:
+        """Visszaadja az eseménnyel érintett cella sor- és oszlopindexeit."""
+        grid_info = event.widget.grid_info()
+        return grid_info.get('row'), grid_info.get('column')
 
     def _clear_cell_event_bindings(self):
         """A játékmező összes grafikus elemét eseményérzéketlenné teszi."""
@@ -72,151 +160,575 @@ class GameField(tk.Frame):
 
     def _is_victory_condition_met(self):
         """True értékkel tér vissza, ha a győzelmi feltétel teljesül, vagyis a nem felfedett cellák száma megegyezik az aknák számával."""
-        return len(self.model) - len(self.visited_coords) == self.model.minecount
+        return self.model.is_victory()
+
+    def show_model_state(self):
+        """A modell cellaállapotainak (felfedett és zászlós cellák, felrobbant akna) megjelenítése, pl. egy betöltött
+        mentés folytatásakor."""
+        revealed_cells = {}
+        for index in range(len(self.model)):
+            coords = self.model.virtual_list_index_to_gridcoords(index)
+            if self.model._is_revealed_at(index):
+                revealed_cells[coords] = self.model._adjacent_mine_count_at(index)
+            elif self.model._is_flagged_at(index):
+                self._show_flag(*coords, True)
+        self._show_revealed_cells(revealed_cells)
+        self._update_flag_counter()
+        # Az aknák az első felfedéskor kerülnek elhelyezésre, így felfedett cella nélkül a játék még nem kezdődött el.
+        self.is_first_cell = not self.model.revealed_count
+        if self.model.is_defeat():
+            self._draw_mine_symbol(*self.model.exploded_coords)
+        if self.model.is_defeat() or self.model.is_victory():
+            self.is_game_over = True
+            self._clear_cell_event_bindings()
 
     def _on_cell_left_click(self, event):
         """Bal egérgomb kattintás eseménykezelője."""
-        # Azonosítjuk az eseménnyel érintett widgetet, és meghatározzuk a tartalmazó cella sor- és oszlopindexeit.
-        self.current_widget = event.widget
-        ri, ci = self.current_widget.grid_info().get('row'), self.current_widget.grid_info().get('column')
+        # Meghatározzuk az eseménnyel érintett cella sor- és oszlopindexeit.
+        if (grid_coords := self._event_to_gridcoords(event)) is not None:
+            self.click_cell(*grid_coords)
 
+    def click_cell(self, ri, ci):
+        """A megadott cella kiválasztása (felfedése), mintha a játékos a bal egérgombbal rákattintott volna."""
+        # A zászlóval jelölt cella nem fedhető fel.
+        if self.is_game_over or self.model.is_flagged(ri, ci):
+            return
+        # A játékos első lépésekor indítjuk az időmérőt. Ha közben leállt (pl. a játékjellemzők párbeszédablaka
+        # hibás bevitellel zárult), akkor a már eltelt időtől folytatódik. Új játékmezőnél ez nulla (ld. reset()).
+        if not self.stop_watch.is_running:
+            self.stop_watch.start(self.stop_watch.elapsed_time())
+        # Ha a kiválasztott cella már fel van fedve, akkor a zászló nélküli szomszédait fedjük fel, amennyiben a
+        # szomszédos zászlók száma megegyezik a cellára kiírt aknaszámmal.
+        if self.model.is_revealed(ri, ci):
+            self._log_move(game_file.CHORD, ri, ci)
+            self._chord_cell(ri, ci)
+            self._check_end_of_game()
+            return
+
+        self._log_move(game_file.REVEAL, ri, ci)
         if self.is_first_cell:
-            if self.model.get_value(ri, ci):
-                # Ha a kiválasztott mező az első és ezen akna van, akkor addig helyezzük újra az aknákat, hogy ezen a mezőn ne legyen.
-                while self.model.gridcoords_to_virtual_list_index(ri, ci) in self.model.virtual_list_indexes_of_mines:
-                    self.model.generate_mines_randomly()
-            # A legelső cella kiválasztásakor indítjuk az időmérőt.
-            self.stop_watch.start()
+            # Az adott számú akna véletlenszerű elhelyezése a cellákban úgy, hogy az első kiválasztott mezőn (és ha így van
+            # beállítva, akkor a szomszédain se) legyen akna.
+            self.model.generate_mines_randomly(safe_cell=(ri, ci), safe_neighbours=self.safe_first_neighbours,
+                                               seed=self.seed)
             self.is_first_cell = False
 
-        if self.model.get_value(ri, ci):
-            # Ha a kiválasztott mezőn akna van, akkor a játék vereséggel véget ér.
-            self._end_game_defeat()
-            return
-
-        # A kiválasztott, azaz felfedett cellának megváltoztatjuk a kinézetét.
-        self.current_widget.config(relief=tk.SOLID, bd=1, bg='white')
-        # A cellát megjelöljük felfedettnek (látogatottként) eltárolva a rácskoordinátáit.
-        self.visited_coords.add((ri, ci))
+        # A kiválasztott cella felfedése. Ha a cella szomszédai között nincs akna, akkor automatikusan felfedjük az összes
+        # cellát, amelyeken nincs akna, mindaddig, amíg olyan cellákat nem találunk, amelyeknek a szomszédságában van
+        # legalább egy akna. Az ilyen cellákra a szomszédos aknák száma kiírásra kerül.
+        self._explore_safe_fields(ri, ci)
+        # Ha a kiválasztott mezőn akna volt, akkor a játék vereséggel, ha pedig a kattintás után teljesül a nyerési
+        # feltétel, akkor győzelemmel ér véget.
+        self._check_end_of_game()
 
-        # Ha a kiválasztott cella szomszédai között van legalább egy akna, akkor a mezőre kiírjuk a szomszédos aknák számát.
-        if mine_count := self.model.number_of_mines_in_adjacent_cells(ri, ci):
-            self._show_minecount_on_current_cell(mine_count)
-        else:
-            # Ha a kiválasztott cella szomszédain nincs akna, akkor automatikusan felfedjük az összes cellát, amelyeken
-            # nincs akna, mindaddig, amíg olyan cellákat nem találunk, amelyeknek a szomszédságában van legalább egy akna.
-            # Az ilyen cellákra a szomszédos aknák száma kiírásra kerül.
-            self._explore_safe_fields(ri, ci)
+    def open_start_cell(self, ri, ci):
+        """Az aknák elhelyezése és a megadott első cella felfedése a játékos lépése nélkül, pl. egy találgatás nélkül
+        megoldható tábla kezdőcellájáé. Az időmérő a játékos első lépésekor indul."""
+        self._log_move(game_file.REVEAL, ri, ci)
+        self.model.generate_mines_randomly(safe_cell=(ri, ci), safe_neighbours=self.safe_first_neighbours, seed=self.seed)
+        self.is_first_cell = False
+        self._show_revealed_cells(self.model.reveal(ri, ci))
 
-        # Ha az aktuális cellára kattintás után teljesül a nyerési feltétel, akkor a játék ennek megfelelően véget ér.
-        if self._is_victory_condition_met():
+    def _check_end_of_game(self):
+        """A modell állapota alapján vereséggel vagy győzelemmel befejezi a játékot, ha az véget ért."""
+        if self.model.is_defeat():
+            self._end_game_defeat(*self.model.exploded_coords)
+        elif self._is_victory_condition_met():
             self._end_game_wictory()
 
     def _explore_safe_fields(self, ri, ci):
         """Felfedi az összes olyan cellát, amelyeken nincs akna, mindaddig, amíg olyan cellákat nem találunk, amelyeknek a
         szomszédságában van legalább egy akna. Az ilyen cellákra a szomszédos aknák száma kiírásra kerül.
         """
-        # Az alkalmazott algoritmus:
-        # 1. Nézd meg, hogy az aktuális, (ri, ci) rácskoordinátájú cella szomszédai tartalmaznak-e aknát.
-        # 2a. Ha igen,
-        # - írd ki az aktuális cellában a szomszédos aknák számát. Lépj ki az eljárásból és
-        #   várj a köv. cellakiválasztásra.
-        # 2b. Ha nem, azaz nincs a szomszédban akna, akkor
-        # - vedd sorban egymás után az aktuális cella még fel nem fedett szomszédait,
-        # - minden egyes szomszéd cellára, annak koordinátáját véve aktuális cellának
-        #   ismételd meg az 1. ponttól. (vagyis hívd meg ezen koordinátákkal e metódust újra).
-
-        adj_ri, adj_ci = ri, ci
-        # Ha a kiválasztott cella szomszédai között van legalább egy akna, akkor a mezőre kiírjuk a
-        # szomszédos aknák számát és visszatérünk e metódusból.
-        if mine_count := self.model.number_of_mines_in_adjacent_cells(adj_ri, adj_ci):
-            self._show_minecount_on_current_cell(mine_count)
-        else:
-            # Ha a szomszédok között nincs akna, akkor sorra vesszük a még nem felfedett szomszédokat, és megnézzük, hogy
-            # azokban hány akna van. Ha azokban sincs akna, akkor tovább folytatjuk azok szomszédaival.
-            for adj_ri, adj_ci in (set(self.model.adjacent_cells_coords(adj_ri, adj_ci)) - self.visited_coords):
-                self.current_widget: tk.Canvas = self.grid_slaves(adj_ri, adj_ci)[0]
-                # A felfedett cellának megváltoztatjuk a kinézetét.
-                self.current_widget.config(relief=tk.SOLID, bd=1, bg='white')
-                # A cellát megjelöljük felfedettnek eltárolva a rácskoordinátáit.
-                self.visited_coords.add((adj_ri, adj_ci))
-                # Ha a cella felfedése nyerő helyzetet terent, akkor kilépünk, egyébként pedig folytatjuk a cellák felfedését
-                # az aktuális rácskoordinátájú cellától kiindulva.
-                if self._is_victory_condition_met():
-                    return
-                else:
-                    self._explore_safe_fields(adj_ri, adj_ci)
+        # A felfedendő cellákat a modell határozza meg és jelöli felfedettnek egy lépésben, majd ezeket egyetlen
+        # menetben jelenítjük meg.
+        self._show_revealed_cells(self.model.reveal(ri, ci))
+
+    def _chord_cell(self, ri, ci):
+        """A felfedett cella zászló nélküli szomszédainak felfedése, ha a szomszédos zászlók száma megegyezik a cellára
+        kiírt aknaszámmal (ld. MinesweeperModel.chord())."""
+        self._show_revealed_cells(self.model.chord(ri, ci))
+
+    def _show_revealed_cells(self, revealed_cells):
+        """A modell által felfedett cellák megjelenítésének ütemezése. A számot mutató cellák a megoldónak
+        átadandó cellák közé kerülnek. Az aknamentes szomszédságú cellák közül csak azok, amelyek a megoldó által már
+        ismert számot mutató cellával szomszédosak, mivel ezek felfedése annak feltételét megváltoztatja."""
+        show_revealed_cell, schedule, unsolved_cells = self._show_revealed_cell, self.updates.schedule, self.unsolved_cells
+        known_cells, adjacent_cells_coords = self.solver.revealed_cells, self.model.adjacent_cells_coords
+        for coords, mine_count in revealed_cells.items():
+            schedule(coords, show_revealed_cell, *coords, mine_count)
+            if mine_count or (known_cells and any(adjacent in known_cells for adjacent in adjacent_cells_coords(*coords))):
+                unsolved_cells[coords] = mine_count
+
+    def _update_solver(self):
+        """A legutóbbi tippkérés óta felfedett, számot mutató cellák átadása a megoldónak."""
+        if self.unsolved_cells:
+            self.solver.add_revealed_cells(self.unsolved_cells)
+            self.unsolved_cells = {}
 
     def _end_game_wictory(self):
         """Sikeres játék esetén meghívott metódus, amely leállítja az időmérést, feldob egy üzenetablakot,
         és eseményérzéketlenné teszi a cellákat."""
         self.stop_watch.stop()
-        showinfo('a játék eredménye'.upper(), 'NYERTÉL!', detail='Minden aknát feldezetél.')
+        self.is_game_over = True
+        # A modális üzenetablak előtt az utolsó lépés változásait is megjelenítjük.
+        self.updates.flush()
+        showinfo('a játék eredménye'.upper(), 'NYERTÉL!',
+                 detail=f'Minden aknát feldezetél {self.stop_watch.elapsed_time():.2f} másodperc alatt.')
         self._clear_cell_event_bindings()
 
-    def _end_game_defeat(self):
+    def _end_game_defeat(self, ri, ci):
         """Sikertelen játék esetén meghívott metódus, amely kirajzolja az aknát, leállítja az időmérést,
         feldob egy üzenetablakot, és eseményérzéketlenné teszi a cellákat."""
-        self._draw_mine_symbol_in_current_cell()
+        self.updates.flush()
+        self._draw_mine_symbol(ri, ci)
         self.stop_watch.stop()
+        self.is_game_over = True
         self._clear_cell_event_bindings()
         showinfo('a játék eredménye'.upper(), 'Aknára léptél, ezért vesztettél!')
 
-    def _draw_mine_symbol_in_current_cell(self):
-        """Az aktuális cellában egy akna szimbólumot rajzol ki."""
-        w, h = self.current_widget.winfo_width(), self.current_widget.winfo_height()
+    @staticmethod
+    def _draw_mine_symbol_on_canvas(canvas: tk.Canvas, x0, y0, w, h, **options):
+        """A megadott Canvas példányon az (x0, y0) bal felső sarkú, w szélességű és h magasságú területre egy akna
+        szimbólumot rajzol ki."""
         r = w / 4
-        cpx, cpy = w / 2, h / 2
-        x1, y1 = w / 2 - r, h / 2 - r
-        x2, y2 = w / 2 + r, h / 2 + r
-        self.current_widget.create_oval((x1, y1), (x2, y2), fill='black')
+        cpx, cpy = x0 + w / 2, y0 + h / 2
+        x1, y1 = cpx - r, cpy - r
+        x2, y2 = cpx + r, cpy + r
+        canvas.create_oval((x1, y1), (x2, y2), fill='black', **options)
         c = 1.4
         a = c * r * 3 ** 0.5
-        self.current_widget.create_polygon((cpx, cpy - c * r), (cpx + a / 2, cpy + c * r / 2),
-                                           (cpx - a / 2, cpy + c * r / 2), fill='black')
-        self.current_widget.create_polygon((cpx, cpy + c * r), (cpx - a / 2, cpy - c * r / 2),
-                                           (cpx + a / 2, cpy - c * r / 2), fill='black')
-
-    def _show_minecount_on_current_cell(self, mine_count):
-        """Az aktuális cellában egy címkén megjeleníti a szomszédos cellákban található aknák számát."""
-        cnv_size = self.current_widget.winfo_height()
-        lb = tk.Label(self.current_widget, text=str(mine_count), font=('Tahoma', round(cnv_size * 40 / 80), 'bold'),
-                      fg=self.num_colors[mine_count], bg='white')
-        # A címke Canvasra helyezéséhez egy window rajzelemet készítünk a Canvason, amibe a címkét tesszük.
-        self.current_widget.create_window(cnv_size / 2, cnv_size / 2, window=lb, width=self.cell_size, height=self.cell_size)
-        self.current_widget.unbind('<Button 1>')  # Az aktuális felfedett cellát eseményérzéketlenné tesszük.
+        canvas.create_polygon((cpx, cpy - c * r), (cpx + a / 2, cpy + c * r / 2),
+                              (cpx - a / 2, cpy + c * r / 2), fill='black', **options)
+        canvas.create_polygon((cpx, cpy + c * r), (cpx - a / 2, cpy - c * r / 2),
+                              (cpx + a / 2, cpy - c * r / 2), fill='black', **options)
+
+    def _draw_mine_symbol(self, ri, ci):
+        """A megadott cellában egy akna szimbólumot rajzol ki."""
+        cnv: tk.Canvas = self.cells[ri, ci]
+        self._draw_mine_symbol_on_canvas(cnv, 0, 0, cnv.winfo_width(), cnv.winfo_height())
+
+    def _show_revealed_cell(self, ri, ci, mine_count):
+        """A megadott cellát felfedettként jeleníti meg, és ha a szomszédos cellákban van akna, akkor kiírja azok számát."""
+        cnv: tk.Canvas = self.cells[ri, ci]
+        # A felfedett cellának megváltoztatjuk a kinézetét.
+        cnv.config(relief=tk.SOLID, bd=1, bg='white')
+        if not mine_count:
+            return
+        # A szám a Canvas szöveg rajzeleme, így külön widget nem jön létre, és a rá történő kattintás is a Canvas
+        # eseménykezelőjéhez jut (ld. _on_cell_left_click()).
+        cnv_size = cnv.winfo_height()
+        cnv.create_text(cnv_size / 2, cnv_size / 2, text=str(mine_count), fill=self.num_colors[mine_count],
+                        font=('Tahoma', round(cnv_size * 40 / 80), 'bold'))
+
+    def _show_flag(self, ri, ci, flagged):
+        """A megadott cellán megjelenít egy zászlót, ha a flagged igaz, egyébként eltávolítja azt."""
+        cnv: tk.Canvas = self.cells[ri, ci]
+        cnv_size = cnv.winfo_height()
+        if flagged and not cnv.find_withtag('flag'):
+            # Ha még nincs, a Canvas példányon egy zászló karaktert ábrázoló szöveg rajzelemet helyezünk le.
+            cnv.create_text(cnv_size / 2, cnv_size / 2, text=chr(0x1F6A9), tags=('flag',),
+                            font=('Courier', round(self.cell_size * 40 / 80), 'bold'))
+        elif not flagged:
+            cnv.delete('flag')
+
+    def _highlight_cell(self, ri, ci, color):
+        """A megadott, még fel nem fedett cella hátterét a megadott színűre állítja."""
+        self.cells[ri, ci].config(bg=color)
+
+    def show_hint(self):
+        """A megoldó alapján kiemeli a biztosan aknamentes cellákat, vagy ha ilyen nincs, akkor a legkisebb
+        aknavalószínűségű cellát."""
+        if self.is_first_cell or self.is_game_over:
+            return
+        self._update_solver()
+        safe_coords, _ = self.solver.solve()
+        # A megoldó által már aknamentesnek talált cellák közül a közben felfedettek nem kapnak kiemelést.
+        safe_coords = {coords for coords in safe_coords if not self.model.is_revealed(*coords)}
+        if safe_coords:
+            for coords in safe_coords:
+                self.updates.schedule(coords, self._highlight_cell, *coords, 'pale green')
+        elif (hint := self.solver.hint()) is not None:
+            self.updates.schedule(hint[0], self._highlight_cell, *hint[0], 'khaki')
 
     def _on_cell_right_click(self, event):
         """Jobb egérgomb kattintás eseménykezelője.
         Kattintásra az aktuális cellában megjelenít egy zászlót és a zászló számlálót, ami a még nem megjelenített
         zászlók számát tartja nyílván, eggyel csökkenti. Egy újabb kattintásra a zászló eltávolításra kerül és
         a zászló számláló eggyel nö."""
-        current_widget: tk.Canvas = event.widget if type(event.widget) is tk.Canvas else event.widget.master
-        cnv_size = current_widget.winfo_height()
-
-        if not current_widget.gettags('flagwindow'):
-            # Ha még nincs, a Canvas példányon egy címkét helyezünk le, ami egy zászló karakter ábrázol. Ehhez egy window
-            # rajzelemet készítünk a Canvason, amibe a címkét tesszük.
-            lb = tk.Label(current_widget, text=chr(0x1F6A9), font=('Courier', round(self.cell_size * 40 / 80), 'bold'))
-            lb.bind('<Button 3>', self._on_cell_right_click)
-            current_widget.create_window(cnv_size / 2, cnv_size / 2, height=self.cell_size, width=self.cell_size, window=lb,
-                                         tags=('flagwindow',))
-            # A flag számolót, ami a még nem megjelenített zászlók számát tartja nyílván, eggyel csökkentjük.
-            self.flag_counter.set(self.flag_counter.get() - 1)
+        if (grid_coords := self._event_to_gridcoords(event)) is not None:
+            self.toggle_flag_cell(*grid_coords)
+
+    def toggle_flag_cell(self, ri, ci):
+        """A megadott, még fel nem fedett cellán zászlót helyez el, vagy eltávolítja azt, mintha a játékos a jobb
+        egérgombbal rákattintott volna."""
+        if self.is_game_over or self.model.is_revealed(ri, ci):
+            return
+        self._log_move(game_file.FLAG, ri, ci)
+        self.updates.schedule((ri, ci), self._show_flag, ri, ci, self.model.toggle_flag(ri, ci))
+        self._update_flag_counter()
+
+    def _update_flag_counter(self):
+        """A flag számláló a még nem megjelenített zászlók számát mutatja, ezt a modell zászlószámlálójából kapjuk."""
+        self.flag_counter.set(self.model.minecount - self.model.flagged_count)
+
+    def _log_move(self, action, ri, ci):
+        """A lépés hozzáfűzése a lépésnaplóhoz, ha a naplózás be van kapcsolva. A napló az első lépéskor jön létre."""
+        if self.master.move_log_path is None or not self.logs_moves:
+            return
+        if self.move_log is None:
+            self.move_log = game_file.MoveLog(self.master.move_log_path, self.model, self.seed, self.safe_first_neighbours)
+        self.move_log.append(action, ri, ci)
+
+    def apply_move(self, action, ri, ci):
+        """Egy lépésnaplóból visszajátszott lépés végrehajtása. Ha közben új játék indult, akkor a lépés elmarad."""
+        if self.master.game_field is not self:
+            return
+        if action == game_file.FLAG:
+            self.toggle_flag_cell(ri, ci)
         else:
-            # Ha a Canvas példányon már van zászlócímke egy window elemben, akkor azt töröljük.
-            current_widget.delete('flagwindow')
-            # A flag számolót eggyel visszanöveljük.
-            self.flag_counter.set(self.flag_counter.get() + 1)
+            self.click_cell(ri, ci)
+
+
+class CanvasGameField(GameField):
+    """A játékmező, amely a teljes cellatáblát egyetlen Canvas példányon téglalap és szöveg rajzelemekkel jeleníti meg.
+    A kattintások helyét a cellák rácskoordinátáira a pixelkoordinátákból számolással képezi le, így a widgetek száma
+    a tábla méretétől független.
+    """
+
+    def _create_cells(self):
+        """A cellatáblát megjelenítő Canvas példány létrehozása és a cellák téglalapjainak kirajzolása."""
+        self.cell_pitch = self.cell_size + 2 * 6  # Egy cella mérete a szegéllyel együtt, a GameField cellákéval azonosan.
+        self.flag_items = {}  # A zászlókat ábrázoló rajzelemek azonosítói a cellák rácskoordinátái szerint.
+        self.canvas = tk.Canvas(self, width=self.columncount * self.cell_pitch, height=self.rowcount * self.cell_pitch,
+                                highlightthickness=0, bd=0)
+        self.canvas.grid(row=0, column=0, sticky='news')
+        # A cellák téglalapjai sorfolytonosan jönnek létre, így azonosítójuk a virtuális listaindexükből számolható.
+        p = self.cell_pitch
+        self.first_cell_item = self.canvas.create_rectangle(0, 0, p, p, fill='#d9d9d9', outline='gray50', width=2)
+        for ri, ci in product(range(self.rowcount), range(self.columncount)):
+            if ri or ci:
+                self.canvas.create_rectangle(ci * p, ri * p, (ci + 1) * p, (ri + 1) * p, fill='#d9d9d9', outline='gray50', width=2)
+        self.canvas.bind('<Button 1>', self._on_cell_left_click)
+        self.canvas.bind('<Button 3>', self._on_cell_right_click)
+
+    def _event_to_gridcoords(self, event) -> tuple[int, int] | None:
+        """Visszaadja az eseménnyel érintett cella sor- és oszlopindexeit a kattintás pixelkoordinátáiból számolva.
+        A táblán kívül eső kattintás esetén None értéket ad."""
+        ri = int(self.canvas.canvasy(event.y) // self.cell_pitch)
+        ci = int(self.canvas.canvasx(event.x) // self.cell_pitch)
+        if ri not in range(self.rowcount) or ci not in range(self.columncount):
+            return None
+        return ri, ci
+
+    def _clear_cell_event_bindings(self):
+        """A játékmezőt eseményérzéketlenné teszi."""
+        self.canvas.unbind('<1>')
+        self.canvas.unbind('<3>')
+
+    def _draw_mine_symbol(self, ri, ci):
+        """A megadott cellában egy akna szimbólumot rajzol ki."""
+        p = self.cell_pitch
+        self._draw_mine_symbol_on_canvas(self.canvas, ci * p, ri * p, p, p)
+
+    def _show_revealed_cell(self, ri, ci, mine_count):
+        """A megadott cellát felfedettként jeleníti meg, és ha a szomszédos cellákban van akna, akkor kiírja azok számát."""
+        self.canvas.itemconfigure(self.first_cell_item + self.columncount * ri + ci, fill='white', outline='black', width=1)
+        if mine_count:
+            p = self.cell_pitch
+            self.canvas.create_text((ci + 0.5) * p, (ri + 0.5) * p, text=str(mine_count), fill=self.num_colors[mine_count],
+                                    font=('Tahoma', round(p * 40 / 80), 'bold'))
+
+    def _show_flag(self, ri, ci, flagged):
+        """A megadott cellán megjelenít egy zászlót, ha a flagged igaz, egyébként eltávolítja azt."""
+        if not flagged:
+            if (item := self.flag_items.pop((ri, ci), None)) is not None:
+                self.canvas.delete(item)
+        elif (ri, ci) not in self.flag_items:
+            p = self.cell_pitch
+            self.flag_items[ri, ci] = self.canvas.create_text((ci + 0.5) * p, (ri + 0.5) * p, text=chr(0x1F6A9),
+                                                              font=('Courier', round(self.cell_size * 40 / 80), 'bold'))
+
+    def _highlight_cell(self, ri, ci, color):
+        """A megadott, még fel nem fedett cella kitöltőszínét a megadott színűre állítja."""
+        self.canvas.itemconfigure(self.first_cell_item + self.columncount * ri + ci, fill=color)
+
+
+class ViewportGameField(CanvasGameField):
+    """A képernyőnél nagyobb táblákhoz készült, görgethető és nagyítható játékmező. A cellák mérete a tábla
+    méretétől független, és csak a nézetablakban látható, valamint a körülöttük levő overscan szélességű sávba eső
+    cellák kerülnek kirajzolásra. A cellák rajzelemei egy gyűrűs tárolóban vannak, a cella sor- és oszlopindexének
+    a tároló soraival és oszlopaival vett maradéka szerint, így görgetéskor a nézetből kikerülő cellák rajzelemei
+    a nézetbe bekerülő cellák megjelenítésére kerülnek újrafelhasználásra. A rajzelemek száma, és így a memóriaigény
+    is a nézetablak méretével arányos.
+    A görgetés a gördítősávokkal, az egérgörgővel (Shift lenyomásával vízszintesen) és a középső egérgombbal
+    húzva, a nagyítás a Ctrl + egérgörgővel, illetve a + és - billentyűkkel lehetséges.
+    """
+
+    # A nézetablak legnagyobb mérete pixelben.
+    max_view_width, max_view_height = 800, 600
+    # A választható cellaméretek (szegéllyel együtt) pixelben és a kezdeti cellaméret.
+    zoom_levels = (8, 12, 16, 24, 32, 48, 64)
+    default_cell_pitch = 32
+    # A nézetablakon kívül, minden irányban előre kirajzolt cellasorok és -oszlopok száma.
+    overscan = 2
+
+    def _create_cells(self):
+        """A nézetablak Canvas példányának és gördítősávjainak létrehozása, valamint a látható cellák kirajzolása."""
+        self.cell_pitch = self.default_cell_pitch
+        self.highlights = {}  # A tippként kiemelt, még fel nem fedett cellák színei a rácskoordinátáik szerint.
+        self.slots = []  # A cellák rajzelemeinek (téglalap, szöveg) azonosítói a gyűrűs tároló soraiban.
+        self.drawn_rows, self.drawn_columns = range(0), range(0)  # A kirajzolt cellák sor- és oszlopindexei.
+        self.update_id = None  # A látható cellák frissítésének ütemezett hívásazonosítója.
+        self.row_range, self.column_range = self._board_ranges()  # A tábla sor- és oszlopindexei.
+        self.view_width = min(len(self.column_range) * self.cell_pitch, self.max_view_width)
+        self.view_height = min(len(self.row_range) * self.cell_pitch, self.max_view_height)
+        self.canvas = tk.Canvas(self, width=self.view_width, height=self.view_height, highlightthickness=0, bd=0,
+                                bg='#d9d9d9', xscrollincrement=1, yscrollincrement=1)
+        x_scrollbar = tk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.canvas.xview)
+        y_scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+        # A nézet minden változásakor (görgetés, húzás, nagyítás) a Canvas meghívja a gördítősáv beállító parancsát,
+        # ekkor ütemezzük a látható cellák frissítését is.
+        self.canvas.config(xscrollcommand=lambda *args: (x_scrollbar.set(*args), self._schedule_update()),
+                           yscrollcommand=lambda *args: (y_scrollbar.set(*args), self._schedule_update()))
+        self.canvas.grid(row=0, column=0, sticky='news')
+        x_scrollbar.grid(row=1, column=0, sticky='ew')
+        y_scrollbar.grid(row=0, column=1, sticky='ns')
+        self._create_slots()
+        self.canvas.bind('<Button 1>', self._on_cell_left_click)
+        self.canvas.bind('<Button 3>', self._on_cell_right_click)
+        self.canvas.bind('<ButtonPress-2>', lambda event: self.canvas.scan_mark(event.x, event.y))
+        self.canvas.bind('<B2-Motion>', lambda event: self.canvas.scan_dragto(event.x, event.y, gain=1))
+        # Az egérgörgő eseményei Windows és macOS alatt <MouseWheel>, X11 alatt <Button-4> és <Button-5>.
+        for sequence, direction in (('<MouseWheel>', None), ('<Button-4>', -1), ('<Button-5>', 1)):
+            self.canvas.bind(sequence, lambda event, d=direction: self._scroll(event, d, 'y'))
+            self.canvas.bind(f'<Shift-{sequence[1:]}', lambda event, d=direction: self._scroll(event, d, 'x'))
+            self.canvas.bind(f'<Control-{sequence[1:]}', lambda event, d=direction: self._zoom_by_wheel(event, d))
+        self.canvas.bind('<Enter>', lambda event: self.canvas.focus_set())
+        self.canvas.bind('<KeyPress-plus>', lambda event: self.zoom(1))
+        self.canvas.bind('<KeyPress-minus>', lambda event: self.zoom(-1))
+        self._update_visible_cells()
+
+    def _board_ranges(self) -> tuple[range, range]:
+        """A tábla sor- és oszlopindexeinek tartománya."""
+        return range(self.rowcount), range(self.columncount)
+
+    def _create_slots(self):
+        """A gyűrűs tároló rajzelemeinek létrehozása az aktuális cellamérethez. A tároló annyi sorból és oszlopból áll,
+        amennyi a nézetablakot bármely görgetési helyzetben az overscan sávokkal együtt lefedi."""
+        p = self.cell_pitch
+        self.canvas.delete('cell', 'mine')
+        rows, columns = self.row_range, self.column_range
+        self.canvas.config(scrollregion=(columns.start * p, rows.start * p, columns.stop * p, rows.stop * p))
+        slot_rows = min(-(-self.view_height // p) + 1 + 2 * self.overscan, len(rows))
+        slot_columns = min(-(-self.view_width // p) + 1 + 2 * self.overscan, len(columns))
+        font = ('Tahoma', max(round(p * 40 / 80), 1), 'bold')
+        self.slots = [[(self.canvas.create_rectangle(-p, -p, 0, 0, fill='#d9d9d9', outline='gray50', width=2, tags='cell'),
+                        self.canvas.create_text(-p, -p, font=font, tags='cell'))
+                       for _ in range(slot_columns)] for _ in range(slot_rows)]
+        self.drawn_rows, self.drawn_columns = range(0), range(0)
+        if self.model.is_defeat():
+            self._draw_mine_symbol(*self.model.exploded_coords)
+
+    def _schedule_update(self):
+        """A látható cellák frissítésének ütemezése. Egy eseménykezelésen belüli több nézetváltozás egyetlen
+        frissítést eredményez."""
+        if self.update_id is None:
+            self.update_id = self.after_idle(self._update_visible_cells)
+
+    def _visible_ranges(self) -> tuple[range, range]:
+        """A nézetablakban látható és az overscan sávba eső cellák sor- és oszlopindexei."""
+        p, overscan = self.cell_pitch, self.overscan
+        x0, y0 = self.canvas.canvasx(0), self.canvas.canvasy(0)
+        rows = range(max(int(y0 // p) - overscan, self.row_range.start),
+                     min(int((y0 + self.view_height) // p) + 1 + overscan, self.row_range.stop))
+        columns = range(max(int(x0 // p) - overscan, self.column_range.start),
+                        min(int((x0 + self.view_width) // p) + 1 + overscan, self.column_range.stop))
+        return rows, columns
+
+    def _update_visible_cells(self):
+        """A nézetbe újonnan bekerült cellák kirajzolása a nézetből kikerült cellák rajzelemeinek újrafelhasználásával."""
+        self.update_id = None
+        rows, columns = self._visible_ranges()
+        drawn_rows, drawn_columns = self.drawn_rows, self.drawn_columns
+        for ri in rows:
+            is_drawn_row = ri in drawn_rows
+            for ci in columns:
+                if not (is_drawn_row and ci in drawn_columns):
+                    self._draw_cell(ri, ci)
+        self.drawn_rows, self.drawn_columns = rows, columns
+
+    def _draw_cell(self, ri, ci):
+        """A cella megjelenítése a gyűrűs tárolóban hozzá tartozó rajzelemekkel a modellbeli állapota szerint."""
+        rectangle, text = self.slots[ri % len(self.slots)][ci % len(self.slots[0])]
+        p = self.cell_pitch
+        self.canvas.coords(rectangle, ci * p, ri * p, (ci + 1) * p, (ri + 1) * p)
+        self.canvas.coords(text, (ci + 0.5) * p, (ri + 0.5) * p)
+        cell_state = self.model.cell_state(ri, ci)
+        if cell_state == self.model.REVEALED:
+            mine_count = self.model.number_of_mines_in_adjacent_cells(ri, ci)
+            self.canvas.itemconfigure(rectangle, fill='white', outline='black', width=1)
+            self.canvas.itemconfigure(text, text=str(mine_count) if mine_count else '', fill=self.num_colors.get(mine_count))
+        else:
+            self.canvas.itemconfigure(rectangle, fill=self.highlights.get((ri, ci), '#d9d9d9'), outline='gray50', width=2)
+            self.canvas.itemconfigure(text, text=chr(0x1F6A9) if cell_state == self.model.FLAGGED else '', fill='black')
+
+    def _is_drawn(self, ri, ci) -> bool:
+        return ri in self.drawn_rows and ci in self.drawn_columns
+
+    def show_model_state(self):
+        """A modell cellaállapotainak megjelenítése egy betöltött mentés folytatásakor. A cellák a modell alapján,
+        a nézetbe kerülésükkor rajzolódnak ki (ld. _draw_cell()), ezért a teljes tábla bejárása helyett csak a látható
+        cellák kerülnek kirajzolásra, és a megoldó is csak a látható, számot mutató felfedett cellákat kapja meg."""
+        self._update_flag_counter()
+        # Az aknák az első felfedéskor kerülnek elhelyezésre, így felfedett cella nélkül a játék még nem kezdődött el.
+        self.is_first_cell = not self.model.revealed_count
+        if self.model.is_defeat() or self.model.is_victory():
+            self.is_game_over = True
+            self._clear_cell_event_bindings()
+        self.drawn_rows, self.drawn_columns = range(0), range(0)
+        self._update_visible_cells()
+        for ri in self.drawn_rows:
+            for ci in self.drawn_columns:
+                if self.model.is_revealed(ri, ci) and (mine_count := self.model.number_of_mines_in_adjacent_cells(ri, ci)):
+                    self.unsolved_cells[ri, ci] = mine_count
+
+    def zoom(self, step: int):
+        """A cellaméret step szintnyi növelése (negatív step esetén csökkentése) a nézetablak közepén levő pont
+        helyben tartásával."""
+        levels = self.zoom_levels
+        level = min(max(levels.index(self.cell_pitch) + step, 0), len(levels) - 1)
+        if levels[level] == self.cell_pitch:
+            return
+        # A nézetablak közepének helye cellaegységben, amit a nagyítás után is középen tartunk.
+        center_x = (self.canvas.canvasx(0) + self.view_width / 2) / self.cell_pitch
+        center_y = (self.canvas.canvasy(0) + self.view_height / 2) / self.cell_pitch
+        self.cell_pitch = levels[level]
+        self._create_slots()
+        self.center_view(center_y, center_x)
+
+    def center_view(self, row, column):
+        """A nézet görgetése úgy, hogy a megadott (cellaegységben, tört értékként is megadható) pont legyen középen."""
+        p, rows, columns = self.cell_pitch, self.row_range, self.column_range
+        self.canvas.xview_moveto((column * p - self.view_width / 2 - columns.start * p) / (len(columns) * p))
+        self.canvas.yview_moveto((row * p - self.view_height / 2 - rows.start * p) / (len(rows) * p))
+        self._schedule_update()
+
+    def _event_to_gridcoords(self, event) -> tuple[int, int] | None:
+        """Visszaadja az eseménnyel érintett cella sor- és oszlopindexeit a kattintás pixelkoordinátáiból számolva.
+        A táblán kívül eső kattintás esetén None értéket ad."""
+        ri = int(self.canvas.canvasy(event.y) // self.cell_pitch)
+        ci = int(self.canvas.canvasx(event.x) // self.cell_pitch)
+        if ri not in self.row_range or ci not in self.column_range:
+            return None
+        return ri, ci
+
+    def _scroll(self, event, direction, axis):
+        """Görgetés az egérgörgővel. A direction X11 alatt a görgetés iránya, egyébként az esemény delta értékéből adódik."""
+        if direction is None:
+            direction = -1 if event.delta > 0 else 1
+        view = self.canvas.xview_scroll if axis == 'x' else self.canvas.yview_scroll
+        view(direction * 3 * self.cell_pitch, 'units')
+
+    def _zoom_by_wheel(self, event, direction):
+        if direction is None:
+            direction = -1 if event.delta > 0 else 1
+        self.zoom(-direction)
+
+    def _show_revealed_cell(self, ri, ci, mine_count):
+        """A felfedett cella megjelenítése, ha az a kirajzolt területre esik. A többi cella a nézetbe kerülésekor,
+        a modell állapota alapján jelenik meg."""
+        self.highlights.pop((ri, ci), None)
+        if self._is_drawn(ri, ci):
+            self._draw_cell(ri, ci)
+
+    def _show_flag(self, ri, ci, flagged):
+        if self._is_drawn(ri, ci):
+            self._draw_cell(ri, ci)
+
+    def _highlight_cell(self, ri, ci, color):
+        self.highlights[ri, ci] = color
+        if self._is_drawn(ri, ci):
+            self._draw_cell(ri, ci)
+
+    def _draw_mine_symbol(self, ri, ci):
+        """A megadott cellában egy akna szimbólumot rajzol ki. A nagyításkor újrarajzolás miatt 'mine' címkével."""
+        p = self.cell_pitch
+        self._draw_mine_symbol_on_canvas(self.canvas, ci * p, ri * p, p, p, tags='mine')
+
+
+class EndlessGameField(ViewportGameField):
+    """A végtelen aknamező (ld. EndlessMinesweeperModel) játékmezője. A Canvas görgetési tartománya véges, ezért
+    a nézetablak az origó körüli, minden irányban extent cellányi területen mozoghat, ami kézi görgetéssel
+    gyakorlatilag bejárhatatlan. A kirajzolás a nézetablakhoz, a modell memóriaigénye a bejárt területhez igazodik.
+    A zászlószámláló a lehelyezett zászlók számát mutatja, a lépések nem kerülnek naplózásra.
+    """
+
+    # A bejárható terület mérete az origótól minden irányban, cellában.
+    extent = 2 ** 20
+    # Az első kiválasztott cella szomszédai is aknamentesek, így a játék mindig egy felfedett területtel indul.
+    safe_first_neighbours = True
+
+    def _create_cells(self):
+        super()._create_cells()
+        self.center_view(0.5, 0.5)
+
+    def _board_ranges(self) -> tuple[range, range]:
+        return range(-self.extent, self.extent), range(-self.extent, self.extent)
+
+    def _update_flag_counter(self):
+        self.flag_counter.set(self.model.flagged_count)
+
+    def show_hint(self):
+        """A megoldó alapján kiemeli a biztosan aknamentes cellákat. Valószínűségi tipp nincs, mivel az aknák
+        száma végtelen."""
+        if self.is_first_cell or self.is_game_over:
+            return
+        self._update_solver()
+        safe_coords, _ = self.solver.solve()
+        for coords in safe_coords:
+            if self.model.is_revealed(*coords):
+                continue
+            self.updates.schedule(coords, self._highlight_cell, *coords, 'pale green')
+
+    def _log_move(self, action, ri, ci):
+        pass
 
 
 class MineSweeper(tk.Tk):
-    def __init__(self, row_count=8, column_count=8, mine_count=None):
+    # Az a cellaszám, amely felett a játékmező automatikusan egyetlen Canvas példányon jelenik meg.
+    single_canvas_threshold = 400
+    # Az a cellaszám, amely felett a játékmező automatikusan görgethető, nagyítható nézetablakban jelenik meg.
+    viewport_threshold = 10_000
+    # Az a cellaszám, amely felett a modell (ha a numpy csomag elérhető) NumPy tömbökben tárolja az aknákat.
+    numpy_threshold = 10_000
+    # Az a cellaszám, amely felett a modell a cellákat bitenként tömörítve tárolja. A felfedett cellák halmaza
+    # efelett a tárolási módtól függetlenül túl sok memóriát foglalna.
+    bits_threshold = 1_000_000
+    # Üres táblakészlet esetén az új játék indításakor várakozással járó táblakeresés próbálkozásainak legnagyobb száma.
+    no_guess_max_attempts = 20_000
+
+    def __init__(self, row_count=8, column_count=8, mine_count=None, single_canvas: bool | None = None,
+                 move_log_path: str | None = None, viewport: bool | None = None, no_guess: bool = False,
+                 board_pool_path: str | None = DEFAULT_POOL_PATH):
         super().__init__()
         self.title('Aknakereső')
         self.resizable(False, False)
+        # A játékmező megjelenítési módja: True esetén egyetlen Canvas, False esetén cellánként egy Canvas példány,
+        # None esetén a cellaszámtól függően automatikus. Ha a viewport igaz, vagy None értéke mellett a cellaszám
+        # a viewport_threshold értéknél nagyobb, akkor a játékmező görgethető nézetablakban jelenik meg.
+        self.single_canvas = single_canvas
+        self.viewport = viewport
         # A modellobjektum létrehozása.
-        self.model = MinesweeperModel(row_count, column_count, mine_count)
+        self.model = self._create_model(row_count, column_count, mine_count)
+        # Ha meg van adva, akkor a játékok lépései ebbe a fájlba kerülnek naplózásra (mindig az aktuális játéké).
+        self.move_log_path = move_log_path
+        # Ha a no_guess igaz, akkor az új játékok találgatás nélkül megoldható táblával, felfedett kezdőcellával
+        # indulnak. A táblák a board_pool_path fájlból betöltött és a háttérben feltöltött készletből származnak.
+        self.no_guess = no_guess
+        self.board_pool_path = board_pool_path
+        self.board_pool = None
+        self.game_field = None
         self.rowcount, self.columncount, self.minecount = row_count, column_count, self.model.minecount
         # Az aknajelölés (zászlók) számlálójának és a játékidő megjelenítés kontrollváltozók létrehozása.
         self.flag_counter = tk.IntVar(self, value=0, name='flagcounter')
@@ -228,8 +740,19 @@ class MineSweeper(tk.Tk):
         self.control_panel.grid(row=0, column=0, sticky='news')
         # Az aktuális cellaméret meghatározása és a játékterület létrehozása és lehelyezése a főablakban.
         self.cell_size = self.calc_cell_size(self.rowcount, self.columncount)
-        self.game_field = GameField(self, name='gamefield', bd=10, relief=tk.RIDGE)
-        self.game_field.grid(row=1, column=0, sticky='news')
+        self.start_new_game()
+        # A 'h' billentyű lenyomására a játékmező tippet jelenít meg a következő lépéshez.
+        self.bind('<KeyPress-h>', lambda event: self.game_field.show_hint())
+        # A Ctrl+S a játék mentése, a Ctrl+O egy mentett játék betöltése, a Ctrl+R egy lépésnapló visszajátszása.
+        self.bind('<Control-s>', lambda event: self.save_game())
+        self.bind('<Control-o>', lambda event: self.load_game())
+        self.bind('<Control-r>', lambda event: self.replay_move_log())
+        # A Ctrl+G a találgatás nélkül megoldható táblák módját kapcsolja be és ki, és új játékot indít.
+        self.bind('<Control-g>', lambda event: self.toggle_no_guess())
+        # Bekapcsolt mérés esetén az F12 billentyű a mérési eredmények kijelzését kapcsolja be és ki.
+        if profiler.is_enabled:
+            self.debug_overlay = DebugOverlay(self)
+            self.bind('<F12>', lambda event: self.debug_overlay.toggle())
 
     @staticmethod
     def calc_cell_size(row_count, column_count):
@@ -237,30 +760,99 @@ class MineSweeper(tk.Tk):
         Referencia az alapértelmezett 8 sorhoz és 8 oszlophoz tartozó méret."""
         return 40 * 8 / min(row_count, column_count)
 
+    def _uses_viewport(self, cell_count) -> bool:
+        """True értékkel tér vissza, ha a megadott cellaszámú tábla nézetablakban jelenik meg."""
+        return cell_count > self.viewport_threshold if self.viewport is None else self.viewport
+
+    def _create_model(self, row_count, column_count, mine_count) -> MinesweeperModel:
+        """A modellobjektum létrehozása. A tárolási mód a megjelenítési módtól független, csak a cellaszámtól függ:
+        a nagy táblák modellje NumPy tömbökben, a memóriaigény miatt a nagyon nagy tábláké bitenként tömörítve tárol."""
+        cell_count = row_count * column_count
+        if cell_count > self.bits_threshold:
+            return MinesweeperModel(row_count, column_count, mine_count, storage='bits')
+        if cell_count > self.numpy_threshold:
+            try:
+                return MinesweeperModel(row_count, column_count, mine_count, storage='numpy')
+            except ImportError:
+                pass
+        return MinesweeperModel(row_count, column_count, mine_count)
+
+    def _create_game_field(self, **kwargs):
+        """A megjelenítési módnak megfelelő játékterület létrehozása és lehelyezése a főablakban. A kulcsszavas
+        argumentumokat a játékmező kapja meg (ld. GameField)."""
+        if self.game_field is not None:
+            self.game_field.updates.cancel()
+            if self.game_field.move_log is not None:
+                self.game_field.move_log.close()
+        if isinstance(self.model, EndlessMinesweeperModel):
+            self.game_field = EndlessGameField(self, name='gamefield', bd=10, relief=tk.RIDGE, **kwargs)
+            self.game_field.grid(row=1, column=0, sticky='news')
+            return
+        single_canvas = len(self.model) > self.single_canvas_threshold if self.single_canvas is None else self.single_canvas
+        game_field_class = CanvasGameField if single_canvas else GameField
+        if self._uses_viewport(len(self.model)):
+            game_field_class = ViewportGameField
+        self.game_field = game_field_class(self, name='gamefield', bd=10, relief=tk.RIDGE, **kwargs)
+        self.game_field.grid(row=1, column=0, sticky='news')
+
     def start_new_game(self):
         """Új játék indítása. Leállítja az időmérőt, az aktuális modelladatok (sor-, oszlop-, aknaszám) alapján
-        létrehozza az új játékterületet, véletlenszerűen elhelyezi a mezőcellákban az aknákat, és a zászlószámláló
-        kezdőértékét az aknaszámra állítja.
+        létrehozza az új játékterületet, és a zászlószámláló kezdőértékét az aknaszámra állítja. Az aknák az első
+        cella kiválasztásakor kerülnek véletlenszerűen elhelyezésre. Ha a találgatás nélkül megoldható táblák módja be van
+        kapcsolva, akkor az aknák a készletből kapott tábla szerint kerülnek elhelyezésre, és a kezdőcella felfedésre kerül.
         """
         self.stop_watch.stop()
-        self.game_field = GameField(self, name='gamefield', bd=10, relief=tk.RIDGE)
-        self.game_field.grid(row=1, column=0, sticky='news')
+        if not self.no_guess or isinstance(self.model, EndlessMinesweeperModel):
+            self._create_game_field()
+            return
+        # A találgatás nélkül megoldható tábla a készletből azonnal rendelkezésre áll, üres készlet esetén
+        # (pl. egy ritkán használt táblaméretnél) a keresésére várni kell. A keresés a háttérben fut, a várakozás
+        # alatt egy megszakítható várakozó ablak jelenik meg (ld. BoardSearchDialog).
+        if self.board_pool is None:
+            self.board_pool = NoGuessBoardPool(path=self.board_pool_path)
+        # A seed érték csak a vele ellenőrzött tárolási módú modellben ad találgatás nélkül megoldható táblát.
+        storage = game_file.storage_of(self.model)
+        seed = self.board_pool.take(self.rowcount, self.columncount, self.model.minecount, storage)
+        if seed is None:
+            search = self.board_pool.search(self.rowcount, self.columncount, self.model.minecount, storage,
+                                            self.no_guess_max_attempts)
+            BoardSearchDialog(self, search, self._start_no_guess_game)
+            return
+        self._start_no_guess_game(seed)
 
-        self.model.generate_mines_randomly()
-        self.flag_counter.set(self.model.minecount)
+    def _start_no_guess_game(self, seed: int | None):
+        """A seed értékű, találgatás nélkül megoldható táblájú játék indítása felfedett kezdőcellával. None esetén
+        (megszakított vagy sikertelen keresés után) a játék a szokásos módon, véletlen táblával indul."""
+        if seed is None:
+            self._create_game_field()
+            return
+        self._create_game_field(seed=seed)
+        self.game_field.safe_first_neighbours = True
+        self.game_field.open_start_cell(*start_cell(self.rowcount, self.columncount))
+
+    def toggle_no_guess(self):
+        """A találgatás nélkül megoldható táblák módjának be- és kikapcsolása, majd új játék indítása."""
+        self.no_guess = not self.no_guess
+        self.start_new_game()
 
     def size_new_gamefield(self):
         """A megjelenő párbeszédablakban a játékterület méreteit (sor- és oszlopszám) és opcionálisan az aknák számát
         lehet megadni. Ha az aknaszám nincs megadva, akkor a megadott sor- és oszlopszámból kiadódó cellaszám egy, a modellben
         meghatározott aránya lesz az aknaszám. Alapértelmezett játékterület 8x8 méretű 10 aknával, ez jelenik meg a párbeszédablakban
         kezdőértékként. Az adatok helytelen megadása esetén egy felugró üzenetablak figyelmeztet erre.
+        A 'végtelen' szó megadásával végtelen aknamezős játék indul (ld. EndlessMinesweeperModel).
         """
         self.stop_watch.stop()
         default = '8, 8, 10'
         input_string = askstring('A játékjellemzők meghatározása'.upper(),
-                                 'Add meg vesszővel elválasztva a sor és oszlopszámot, valamint az aknák számát (opcionális)',
+                                 'Add meg vesszővel elválasztva a sor és oszlopszámot, valamint az aknák számát (opcionális), '
+                                 'vagy írd be, hogy végtelen',
                                  initialvalue=default)
         txt = input_string if input_string else default
+        if txt.strip().lower() == 'végtelen':
+            self.model = EndlessMinesweeperModel()
+            self.start_new_game()
+            return
         try:  # Input szintaxis ellenőrzése.
             self.rowcount, self.columncount, *minecount = (int(c) for c in txt.strip(',').split(','))
             self.minecount = int(minecount[0]) if minecount else None
@@ -268,15 +860,106 @@ class MineSweeper(tk.Tk):
             showerror(f'játékjellemző megadási hiba'.upper(), 'Hibás sor-, oszlop-, vagy aknaszám megadás.')
             return
         try:  # Csak a modell szerint helyes adatokkal indul újra a játék.
-            self.model = MinesweeperModel(self.rowcount, self.columncount, self.minecount)
+            self.model = self._create_model(self.rowcount, self.columncount, self.minecount)
             self.cell_size = self.calc_cell_size(self.rowcount, self.columncount)
             self.start_new_game()
         except ValueError as exc:
             showerror(f'játékjellemző értékadási hiba'.upper(), 'Nem megfelelő sor-, oszlop-, vagy aknaszám.',
                       detail=exc)
 
+    def _set_model(self, model: MinesweeperModel):
+        """A modell cseréje és a tábla méretétől függő adatok aktualizálása."""
+        self.model = model
+        self.rowcount, self.columncount, self.minecount = model.rowcount, model.columncount, model.minecount
+        self.cell_size = self.calc_cell_size(self.rowcount, self.columncount)
+
+    def save_game(self):
+        """Az aktuális játék mentése a megjelenő párbeszédablakban megadott fájlba (ld. game_file.save_game())."""
+        if isinstance(self.model, EndlessMinesweeperModel):
+            showerror('mentési hiba'.upper(), 'A végtelen aknamezős játék nem menthető.')
+            return
+        path = asksaveasfilename(defaultextension='.msw', filetypes=[('Aknakereső mentés', '*.msw')])
+        if not path:
+            return
+        try:
+            game_file.save_game(self.model, path, self.stop_watch.elapsed_time())
+        except OSError as exc:
+            showerror('mentési hiba'.upper(), 'A játék nem menthető.', detail=exc)
+
+    def load_game(self):
+        """A megjelenő párbeszédablakban kiválasztott mentett játék betöltése és folytatása."""
+        path = askopenfilename(filetypes=[('Aknakereső mentés', '*.msw')])
+        if not path:
+            return
+        try:
+            model, elapsed_time = game_file.load_game(path)
+        except (OSError, ValueError) as exc:
+            showerror('betöltési hiba'.upper(), 'A mentett játék nem tölthető be.', detail=exc)
+            return
+        self.stop_watch.stop()
+        self._set_model(model)
+        self._create_game_field(restore_state=True)
+        # A cellák megjelenítése a méretüktől függ, ezért a lehelyezésük után történik.
+        self.update_idletasks()
+        self.game_field.show_model_state()
+        if not self.game_field.is_first_cell and not self.game_field.is_game_over:
+            self.stop_watch.start(elapsed_time)
+
+    def replay_move_log(self, path=None):
+        """A megadott vagy a megjelenő párbeszédablakban kiválasztott lépésnapló visszajátszása valós időben egy új
+        játékmezőn. A lépések a naplóban rögzített időpontokban kerülnek végrehajtásra."""
+        path = path or askopenfilename(filetypes=[('Aknakereső lépésnapló', '*.mswlog')])
+        if not path:
+            return
+        try:
+            header, moves = game_file.read_move_log(path)
+        except (OSError, ValueError) as exc:
+            showerror('betöltési hiba'.upper(), 'A lépésnapló nem tölthető be.', detail=exc)
+            return
+        self.stop_watch.stop()
+        self._set_model(MinesweeperModel(header['rows'], header['columns'], header['mines'], storage=header['storage']))
+        self._create_game_field(seed=header['seed'])
+        game_field = self.game_field
+        game_field.safe_first_neighbours = header['safe_neighbours']
+        for timestamp, action, ri, ci in moves:
+            self.after(round(timestamp * 1000), game_field.apply_move, action, ri, ci)
+
     def run(self):
         self.mainloop()
+        # A készletben maradt táblák a következő indításkor is felhasználhatók.
+        if self.board_pool is not None:
+            self.board_pool.close()
+            if self.board_pool_path is not None:
+                self.board_pool.save(self.board_pool_path)
+
+
+def enable_instrumentation(export_path: str | None = None, trace_allocations: bool = False):
+    """A játék kritikus metódusainak mérése (ld. instrumentation modul): az eseménykezelők és a játékmező
+    létrehozásának futásideje (trace_allocations igaz értéke esetén memóriafoglalása is), a felfedésenként
+    (a szomszédfelfedéseket is beleértve) felfedett cellák száma, a megjelenítés változásainak egy menetben történő
+    végrehajtása és a menetenként végrehajtott változások száma, a létrehozott widgetek és rajzelemek száma, valamint az aknák elhelyezésének futásideje.
+    A MineSweeper létrehozása előtt kell hívni."""
+    def revealed_count(game_field: GameField):
+        return {'revealed_cells': game_field.model.revealed_count}
+
+    def applied_count(updates: UpdateScheduler):
+        return {'updates': updates.applied_count}
+
+    probes = [(GameField, '__init__', None, widget_counts),
+              (GameField, '_on_cell_left_click', None, None),
+              (GameField, '_explore_safe_fields', revealed_count, None),
+              (GameField, '_chord_cell', revealed_count, None),
+              (UpdateScheduler, 'flush', applied_count, None),
+              (GameField, '_on_cell_right_click', None, None)]
+    probes += [(model_class, 'generate_mines_randomly', None, None) for model_class in MODEL_STORAGES.values()
+               if 'generate_mines_randomly' in vars(model_class)]
+    profiler.enable(probes, export_path, trace_allocations)
 
 
-MineSweeper().run()
+if __name__ == '__main__':
+    # A MINESWEEPER_PROFILE környezeti változóban megadott fájlba (.json vagy .csv) kilépéskor a mérési eredmények kerülnek.
+    # A memóriafoglalás mérése a tracemalloc miatt minden foglalást lassít, ezért csak a MINESWEEPER_TRACE_ALLOCATIONS
+    # környezeti változó megadásával kapcsol be.
+    if profile_path := os.environ.get('MINESWEEPER_PROFILE'):
+        enable_instrumentation(profile_path, trace_allocations=bool(os.environ.get('MINESWEEPER_TRACE_ALLOCATIONS')))
+    MineSweeper().run()
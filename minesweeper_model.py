@@ -1,13 +1,40 @@
+from bisect import bisect_right
+from collections import deque
 from itertools import product
-from random import randint
+from random import Random
+
+try:
+    import numpy as np
+except ImportError:  # A NumPy opcionális függőség, csak a NumpyMinesweeperModel osztályhoz szükséges.
+    np = None
 
 
 class MinesweeperModel:
     """Az aknakereső játék cellamezőit modellező osztály bináris mátrixként megvalósítva, ahol az 1 értékek az
-    elhelyezett aknákat jelentik.
+    elhelyezett aknákat jelentik. A modell a cellák játékbeli állapotát (fel nem fedett, felfedett, zászlós,
+    felrobbant) is nyilvántartja, a felfedett és a zászlós cellák számát pedig folyamatosan vezetett számlálókban tárolja.
     """
 
-    def __init__(self, row_count: int, column_count: int, mine_count: int | None = None):
+    # A cellák lehetséges állapotai.
+    HIDDEN, REVEALED, FLAGGED, EXPLODED = 'hidden', 'revealed', 'flagged', 'exploded'
+
+    def __new__(cls, *args, storage: str | None = None, **kwargs):
+        # A storage argumentummal megadott tárolási módnak megfelelő modellosztály példánya jön létre. A tárolási mód
+        # feloldása és ellenőrzése csak itt történik, az __init__ metódusok a storage argumentumot figyelmen kívül hagyják.
+        if storage is not None:
+            if storage not in MODEL_STORAGES:
+                raise ValueError(f'Ismeretlen tárolási mód: {storage}. Lehetséges értékek: {", ".join(MODEL_STORAGES)}.')
+            storage_cls = MODEL_STORAGES[storage]
+            # Egy alosztály példányosításakor csak a saját tárolási módja adható meg, különben az alosztály
+            # __init__ metódusa nem futna le.
+            if cls is not MinesweeperModel and storage_cls is not cls:
+                raise ValueError(f'A {cls.__name__} osztály tárolási módja nem {storage}.')
+            cls = storage_cls
+        return super().__new__(cls)
+
+    def __init__(self, row_count: int, column_count: int, mine_count: int | None = None, *, storage: str | None = None):
+        # A storage a tárolási mód: 'set' (alapértelmezett), 'numpy' vagy 'bits' (ld. MODEL_STORAGES), csak kulcsszavas
+        # argumentumként adható meg.
         # A sor és oszlopok száma 8 vagy nagyobb egész szám, az aknák száma pozitív egész, ami kisebb, mint a cellák száma.
         if not isinstance(row_count, int) or not isinstance(column_count, int) or row_count < 8 or column_count < 8:
             raise ValueError('A sorok és oszlopok száma egy legalább 8 értékű egész szám kell, hogy legyen.')
@@ -19,7 +46,18 @@ class MinesweeperModel:
         if minecount >= len(self):
             raise ValueError('Az aknák száma kisebb kell, hogy legyen a cellák számánál.')
         self.minecount = minecount
-        self.virtual_list_indexes_of_mines = set()  # Az aknák indexei a bináris mátrixot leképező virtuális listában.
+        self.virtual_list_indexes_of_mines = frozenset()
+        self.reset_state()
+
+    @property
+    def virtual_list_indexes_of_mines(self) -> frozenset[int]:
+        """Az aknák indexei a bináris mátrixot leképező virtuális listában. A halmaz csak olvasható, az aknaelrendezés
+        egy új indexhalmaz értékül adásával módosítható (minden tárolási módnál azonos módon)."""
+        return self._mine_indexes
+
+    @virtual_list_indexes_of_mines.setter
+    def virtual_list_indexes_of_mines(self, indexes):
+        self._mine_indexes = frozenset(indexes)
 
     def __str__(self):
         return ''.join([str(self.get_value(*self.virtual_list_index_to_gridcoords(i))) + ('\n' if (i + 1) % self.columncount == 0 else ' ')
@@ -36,11 +74,29 @@ class MinesweeperModel:
         if column_index not in range(self.columncount):
             raise IndexError(f'Az oszlopindex a 0..{self.columncount - 1} tartományon kívül esik.')
 
-    def generate_mines_randomly(self):
-        """Adott számú akna véletlenszerű elhelyezése a cellákban."""
-        self.virtual_list_indexes_of_mines.clear()
-        while len(self.virtual_list_indexes_of_mines) != self.minecount:
-            self.virtual_list_indexes_of_mines.add(randint(0, len(self) - 1))
+    def generate_mines_randomly(self, safe_cell: tuple[int, int] | None = None, safe_neighbours: bool = False,
+                                seed: int | None = None):
+        """Adott számú akna véletlenszerű elhelyezése a cellákban.
+        Ha a safe_cell meg van adva, akkor az így azonosított cellára, és ha a safe_neighbours igaz, akkor a szomszédaira
+        sem kerül akna. Ha a szomszédokkal együtt nem marad elég cella az aknáknak, akkor csak a megadott cella marad
+        aknamentes. Az aknák egyetlen mintavétellel kerülnek elhelyezésre, így a szükséges idő az aknák számával
+        arányos, függetlenül azok sűrűségétől. Azonos seed értékkel az elrendezés reprodukálható.
+        """
+        safe_indexes = self._safe_indexes(safe_cell, safe_neighbours)
+        # A mintavétel a biztonságos cellák nélküli cellák sorszámai közül történik. Egy j sorszámhoz tartozó virtuális
+        # listaindex j + m, ahol m a j-nél nem nagyobb eltolású biztonságos cellák száma (i. biztonságos index - i).
+        shifted_safe_indexes = [index - i for i, index in enumerate(safe_indexes)]
+        sample = Random(seed).sample(range(len(self) - len(safe_indexes)), self.minecount)
+        self.virtual_list_indexes_of_mines = {j + bisect_right(shifted_safe_indexes, j) for j in sample}
+
+    def _safe_indexes(self, safe_cell: tuple[int, int] | None, safe_neighbours: bool) -> list[int]:
+        """Az aknamentesen hagyandó cellák virtuális listaindexei növekvő sorrendben (ld. generate_mines_randomly())."""
+        if safe_cell is None:
+            return []
+        safe_coords = [safe_cell] + (self.adjacent_cells_coords(*safe_cell) if safe_neighbours else [])
+        if len(self) - len(safe_coords) < self.minecount:
+            safe_coords = [safe_cell]
+        return sorted(self.gridcoords_to_virtual_list_index(*coords) for coords in safe_coords)
 
     def gridcoords_to_virtual_list_index(self, row_index, column_index) -> int:
         """A cellarács koordinátáinak (sor- és oszlopindex pár) megfelelő virtuális listaindexszel tér vissza."""
@@ -66,18 +122,358 @@ class MinesweeperModel:
         összesen hány aknát tartalmaznak.
         """
         self._check_indexes(row_index, column_index)
-        return sum(self.get_value(*cell_coords) for cell_coords in self.adjacent_cells_coords(row_index, column_index))
+        return self._adjacent_mine_count_at(self.columncount * row_index + column_index)
+
+    def _adjacent_mine_count_at(self, virtual_list_index) -> int:
+        """A virtuális listaindexszel megadott cella szomszédos aknáinak számát indexellenőrzés nélkül visszaadó segédmetódus."""
+        mines, columncount = self._mine_indexes, self.columncount
+        row_index, column_index = divmod(virtual_list_index, columncount)
+        if 0 < row_index < self.rowcount - 1 and 0 < column_index < columncount - 1:
+            # A tábla belsejében levő cellák nyolc szomszédját közvetlenül, az indexek eltolásával vizsgáljuk.
+            up, down = virtual_list_index - columncount, virtual_list_index + columncount
+            return ((up - 1 in mines) + (up in mines) + (up + 1 in mines)
+                    + (virtual_list_index - 1 in mines) + (virtual_list_index + 1 in mines)
+                    + (down - 1 in mines) + (down in mines) + (down + 1 in mines))
+        return sum(ri * columncount + ci in mines
+                   for ri in range(max(row_index - 1, 0), min(row_index + 2, self.rowcount))
+                   for ci in range(max(column_index - 1, 0), min(column_index + 2, columncount))
+                   if (ri, ci) != (row_index, column_index))
+
+    def reveal_safe_cells(self, row_index, column_index, revealed_coords=frozenset()) -> dict[tuple[int, int], int]:
+        """Az argumentumban megadott, aknát nem tartalmazó cellától kiindulva felfedi az összes olyan cellát, amelyeken
+        nincs akna, mindaddig, amíg olyan cellákat nem talál, amelyeknek a szomszédságában van legalább egy akna.
+        Az újonnan felfedett cellák koordinátáit és szomszédos aknaszámaikat egy szótárban adja vissza.
+        A revealed_coords a már korábban felfedett cellák koordinátái, ezeket a metódus kihagyja.
+        A metódus a cellák állapotát nem változtatja meg (ld. reveal()).
+        """
+        self._check_indexes(row_index, column_index)
+        if (row_index, column_index) in revealed_coords:
+            return {}
+        columncount = self.columncount
+        is_skipped = (lambda index: divmod(index, columncount) in revealed_coords) if revealed_coords else None
+        mine_counts = self._flood_fill(columncount * row_index + column_index, is_skipped)
+        return {divmod(index, columncount): mine_count for index, mine_count in mine_counts.items()}
+
+    def _flood_fill(self, start, is_skipped=None) -> dict[int, int]:
+        """A reveal_safe_cells() és a reveal() által használt bejárás virtuális listaindexekkel. Az is_skipped egy
+        virtuális listaindexet váró függvény, amely igaz értéke esetén a cella kimarad a felfedésből.
+        A felfedett cellák szomszédos aknaszámait a virtuális listaindexeik szerint adja vissza."""
+        rowcount, columncount = self.rowcount, self.columncount
+        adjacent_mine_count_at = self._adjacent_mine_count_at
+        # A már megvizsgált cellák indexeit a seen halmaz tartalmazza.
+        seen = {start}
+        mine_counts = {start: adjacent_mine_count_at(start)}
+        # Rekurzió helyett egy explicit sorban tartjuk nyilván azokat a cellákat, amelyek szomszédságában nincs akna,
+        # és amelyek szomszédait ezért még fel kell fedni.
+        queue = deque([] if mine_counts[start] else [start])
+        inner_offsets = (-columncount - 1, -columncount, -columncount + 1, -1, 1, columncount - 1, columncount, columncount + 1)
+        while queue:
+            index = queue.popleft()
+            ri, ci = divmod(index, columncount)
+            if 0 < ri < rowcount - 1 and 0 < ci < columncount - 1:
+                adjacent_indexes = [index + offset for offset in inner_offsets]
+            else:
+                adjacent_indexes = [columncount * adj_ri + adj_ci
+                                    for adj_ri in range(max(ri - 1, 0), min(ri + 2, rowcount))
+                                    for adj_ci in range(max(ci - 1, 0), min(ci + 2, columncount))]
+            for adjacent_index in adjacent_indexes:
+                if adjacent_index in seen:
+                    continue
+                seen.add(adjacent_index)
+                if is_skipped is not None and is_skipped(adjacent_index):
+                    continue
+                mine_count = mine_counts[adjacent_index] = adjacent_mine_count_at(adjacent_index)
+                if not mine_count:
+                    queue.append(adjacent_index)
+        return mine_counts
+
+    def reset_state(self):
+        """Minden cellát fel nem fedett, zászló nélküli állapotba hoz, és nullázza az állapotszámlálókat."""
+        self._clear_cell_states()
+        self.revealed_count = 0  # A felfedett cellák száma.
+        self.flagged_count = 0  # A zászlóval jelölt cellák száma.
+        self.exploded_coords = None  # Annak a cellának a koordinátái, amelyen a felfedett akna felrobbant.
+
+    def _clear_cell_states(self):
+        """A cellaállapotok tárolóinak kiürítése."""
+        self._revealed_indexes = set()  # A felfedett cellák virtuális listaindexei.
+        self._flagged_indexes = set()  # A zászlóval jelölt cellák virtuális listaindexei.
+
+    def _is_revealed_at(self, virtual_list_index) -> bool:
+        return virtual_list_index in self._revealed_indexes
+
+    def _set_revealed_at(self, virtual_list_index, revealed: bool):
+        (self._revealed_indexes.add if revealed else self._revealed_indexes.discard)(virtual_list_index)
+
+    def _is_flagged_at(self, virtual_list_index) -> bool:
+        return virtual_list_index in self._flagged_indexes
+
+    def _set_flagged_at(self, virtual_list_index, flagged: bool):
+        (self._flagged_indexes.add if flagged else self._flagged_indexes.discard)(virtual_list_index)
+
+    def is_revealed(self, row_index, column_index) -> bool:
+        """True értékkel tér vissza, ha a megadott cella fel van fedve."""
+        return self._is_revealed_at(self.gridcoords_to_virtual_list_index(row_index, column_index))
+
+    def is_flagged(self, row_index, column_index) -> bool:
+        """True értékkel tér vissza, ha a megadott cella zászlóval van jelölve."""
+        return self._is_flagged_at(self.gridcoords_to_virtual_list_index(row_index, column_index))
+
+    def cell_state(self, row_index, column_index) -> str:
+        """A megadott cella állapotával (HIDDEN, REVEALED, FLAGGED vagy EXPLODED) tér vissza."""
+        index = self.gridcoords_to_virtual_list_index(row_index, column_index)
+        if (row_index, column_index) == self.exploded_coords:
+            return self.EXPLODED
+        if self._is_revealed_at(index):
+            return self.REVEALED
+        return self.FLAGGED if self._is_flagged_at(index) else self.HIDDEN
+
+    def is_victory(self) -> bool:
+        """True értékkel tér vissza, ha a győzelmi feltétel teljesül, vagyis a nem felfedett cellák száma megegyezik az
+        aknák számával, és nem robbant fel akna."""
+        return self.exploded_coords is None and len(self) - self.revealed_count == self.minecount
+
+    def is_defeat(self) -> bool:
+        """True értékkel tér vissza, ha felfedésre került egy akna."""
+        return self.exploded_coords is not None
+
+    def toggle_flag(self, row_index, column_index) -> bool:
+        """A megadott, még fel nem fedett cellán elhelyez egy zászlót, ha még nem volt rajta, egyébként eltávolítja azt.
+        True értékkel tér vissza, ha a cellán a hívás után zászló van."""
+        index = self.gridcoords_to_virtual_list_index(row_index, column_index)
+        if self._is_revealed_at(index):
+            return False
+        flagged = not self._is_flagged_at(index)
+        self._set_flagged_at(index, flagged)
+        self.flagged_count += 1 if flagged else -1
+        return flagged
+
+    def reveal(self, row_index, column_index) -> dict[tuple[int, int], int]:
+        """Felfedi a megadott cellát, és ha annak szomszédságában nincs akna, akkor a reveal_safe_cells() metódussal
+        azonos módon a zászlóval nem jelölt cellák közül az összes összefüggő, aknamentes területet. A cellák állapotát
+        és a számlálókat aktualizálja, és az újonnan felfedett cellák szomszédos aknaszámait a rácskoordinátáik szerint
+        adja vissza. Ha a cellán akna van, akkor az felrobban (ld. exploded_coords), és üres szótárral tér vissza,
+        ahogy a már felfedett vagy zászlós cella, valamint a már felrobbant akna utáni hívás esetén is.
+        """
+        index = self.gridcoords_to_virtual_list_index(row_index, column_index)
+        if self.exploded_coords is not None or self._is_revealed_at(index) or self._is_flagged_at(index):
+            return {}
+        if self.get_value(row_index, column_index):
+            self.exploded_coords = (row_index, column_index)
+            return {}
+        is_revealed_at, is_flagged_at = self._is_revealed_at, self._is_flagged_at
+        mine_counts = self._flood_fill(index, lambda i: is_revealed_at(i) or is_flagged_at(i))
+        for index in mine_counts:
+            self._set_revealed_at(index, True)
+        self.revealed_count += len(mine_counts)
+        columncount = self.columncount
+        return {divmod(index, columncount): mine_count for index, mine_count in mine_counts.items()}
+
+    def chord(self, row_index, column_index) -> dict[tuple[int, int], int]:
+        """Ha a megadott felfedett cella szomszédaiban levő zászlók száma megegyezik a szomszédos aknák számával,
+        akkor egy lépésben felfedi a cella összes zászló nélküli, fel nem fedett szomszédját (a reveal() metódussal).
+        Az újonnan felfedett cellák szomszédos aknaszámait adja vissza. Ha egy szomszédon akna van, akkor az felrobban.
+        """
+        index = self.gridcoords_to_virtual_list_index(row_index, column_index)
+        if self.exploded_coords is not None or not self._is_revealed_at(index):
+            return {}
+        adjacent_coords = self.adjacent_cells_coords(row_index, column_index)
+        mine_count = self._adjacent_mine_count_at(index)
+        if not mine_count or sum(self.is_flagged(*coords) for coords in adjacent_coords) != mine_count:
+            return {}
+        revealed_cells = {}
+        for coords in adjacent_coords:
+            revealed_cells.update(self.reveal(*coords))
+            if self.exploded_coords is not None:
+                break
+        return revealed_cells
+
+    def _plane_size(self) -> int:
+        """A cellánként egy bitet tároló bájtsorozat (bitsík) mérete bájtban."""
+        return (len(self) + 7) // 8
+
+    def get_bit_planes(self) -> tuple[bytes, bytes, bytes]:
+        """Az aknák, a felfedett és a zászlós cellák bitsíkjaival tér vissza. Egy cellának a bitsík index // 8 sorszámú
+        bájtjának index % 8 sorszámú bitje felel meg (ld. BitPackedMinesweeperModel), így a bitsíkok a tárolási módtól
+        függetlenül azonos formájúak."""
+        size = self._plane_size()
+        return tuple(bytes(_indexes_to_bits(indexes, size))
+                     for indexes in (self.virtual_list_indexes_of_mines, self._revealed_indexes, self._flagged_indexes))
+
+    def set_bit_planes(self, mine_bits, revealed_bits, flagged_bits):
+        """Az aknaelrendezés és a cellaállapotok beállítása a get_bit_planes() által visszaadott formájú bitsíkokból
+        (bytes, bytearray vagy memoryview). Az állapotszámlálókat nem módosítja."""
+        self.virtual_list_indexes_of_mines = _bits_to_indexes(mine_bits)
+        self._revealed_indexes = _bits_to_indexes(revealed_bits)
+        self._flagged_indexes = _bits_to_indexes(flagged_bits)
 
     def get_value(self, row_index, column_index):
         """Visszaadja megadott sor- és oszlopindexekkel azonosított cella értékét."""
         self._check_indexes(row_index, column_index)
-        return 1 if self.gridcoords_to_virtual_list_index(row_index, column_index) in self.virtual_list_indexes_of_mines else 0
+        return 1 if self.gridcoords_to_virtual_list_index(row_index, column_index) in self._mine_indexes else 0
 
     def __len__(self):
         """Visszaadja cellák számát."""
         return self.columncount * self.rowcount
 
 
+class NumpyMinesweeperModel(MinesweeperModel):
+    """A MinesweeperModel NumPy tömbökkel megvalósított változata.
+    Az aknákat egy uint8 típusú sor x oszlop méretű mátrix tárolja, és minden aknaelrendezéshez egyszer, vektorizált
+    3x3-as szomszédsági összegzéssel kiszámolja a cellák szomszédos aknáinak számát. Így a szomszédos aknák számának
+    lekérdezése egyetlen tömbolvasás.
+    """
+
+    def __init__(self, row_count: int, column_count: int, mine_count: int | None = None, *, storage: str | None = None):
+        if np is None:
+            raise ImportError('A NumpyMinesweeperModel használatához a numpy csomag telepítése szükséges.')
+        super().__init__(row_count, column_count, mine_count)
+
+    @property
+    def virtual_list_indexes_of_mines(self) -> frozenset[int]:
+        """Az aknák indexei a bináris mátrixot leképező virtuális listában (csak olvasható, ld. MinesweeperModel)."""
+        return frozenset(np.flatnonzero(self.mine_grid).tolist())
+
+    @virtual_list_indexes_of_mines.setter
+    def virtual_list_indexes_of_mines(self, indexes):
+        # Az aknamátrix felépítése a megadott indexekből, majd a szomszédos aknaszámok újraszámolása.
+        self.mine_grid = np.zeros((self.rowcount, self.columncount), dtype=np.uint8)
+        self.mine_grid.flat[np.fromiter(indexes, dtype=np.intp)] = 1
+        self._update_adjacent_mine_counts()
+
+    def _update_adjacent_mine_counts(self):
+        """Minden cellára kiszámolja a szomszédos aknák számát az aknamátrix eltolt példányainak összegzésével."""
+        padded = np.pad(self.mine_grid, 1)
+        counts = np.zeros_like(self.mine_grid)
+        for dr, dc in product(range(3), range(3)):
+            if (dr, dc) != (1, 1):
+                counts += padded[dr:dr + self.rowcount, dc:dc + self.columncount]
+        self.adjacent_mine_counts = counts
+
+    def _adjacent_mine_count_at(self, virtual_list_index) -> int:
+        """A szomszédos aknák számát indexellenőrzés nélkül, az előre kiszámolt mátrixból visszaadó segédmetódus."""
+        return self.adjacent_mine_counts.item(virtual_list_index)
+
+    def get_value(self, row_index, column_index):
+        """Visszaadja megadott sor- és oszlopindexekkel azonosított cella értékét."""
+        self._check_indexes(row_index, column_index)
+        return int(self.mine_grid[row_index, column_index])
+
+
+class BitPackedMinesweeperModel(MinesweeperModel):
+    """A MinesweeperModel bitenként tömörített tárolású változata nagyon nagy táblákhoz.
+    Az aknák, valamint a felfedett és a zászlóval jelölt cellák egy-egy bytearray bitjeiben tárolódnak (egy cellának
+    az index // 8 sorszámú bájt index % 8 sorszámú bitje felel meg), így cellánként összesen 3 bit szükséges. A szomszédos
+    aknák száma nem kerül tárolásra, hanem lekérdezéskor a bitekből számolódik.
+    """
+
+    @staticmethod
+    def _get_bit(plane: bytearray, virtual_list_index: int) -> int:
+        return plane[virtual_list_index >> 3] >> (virtual_list_index & 7) & 1
+
+    @staticmethod
+    def _set_bit(plane: bytearray, virtual_list_index: int, value: bool):
+        if value:
+            plane[virtual_list_index >> 3] |= 1 << (virtual_list_index & 7)
+        else:
+            plane[virtual_list_index >> 3] &= ~(1 << (virtual_list_index & 7)) & 0xFF
+
+    @property
+    def virtual_list_indexes_of_mines(self) -> frozenset[int]:
+        """Az aknák indexei a bináris mátrixot leképező virtuális listában (csak olvasható, ld. MinesweeperModel)."""
+        return frozenset(_bits_to_indexes(self.mine_bits))
+
+    @virtual_list_indexes_of_mines.setter
+    def virtual_list_indexes_of_mines(self, indexes):
+        self.mine_bits = _indexes_to_bits(indexes, self._plane_size())
+
+    def generate_mines_randomly(self, safe_cell: tuple[int, int] | None = None, safe_neighbours: bool = False,
+                                seed: int | None = None):
+        """Adott számú akna véletlenszerű elhelyezése a cellákban (a paraméterek jelentése a MinesweeperModel
+        generate_mines_randomly() metódusáéval azonos).
+        A teljes indexlista helyett közvetlenül a bitekbe sorsol, a már kiválasztott cellákat újrasorsolva. Ha az
+        aknák a szabad cellák felénél többet tesznek ki, akkor az aknamentes cellák kerülnek kisorsolásra, így
+        a várható sorsolásszám legfeljebb kétszerese a kiválasztandó cellák számának.
+        """
+        safe_indexes = self._safe_indexes(safe_cell, safe_neighbours)
+        free_count = len(self) - len(safe_indexes)
+        invert = self.minecount > free_count // 2
+        target = free_count - self.minecount if invert else self.minecount
+        rng, bits = Random(seed), bytearray(self._plane_size())
+        # A biztonságos cellák a sorsolás idejére foglaltnak számítanak.
+        for index in safe_indexes:
+            self._set_bit(bits, index, True)
+        chosen = 0
+        while chosen < target:
+            index = rng.randrange(len(self))
+            if not bits[index >> 3] >> (index & 7) & 1:
+                bits[index >> 3] |= 1 << (index & 7)
+                chosen += 1
+        if invert:
+            # A kisorsolt aknamentes és a biztonságos cellákon kívül minden cellán akna van.
+            all_cells = (1 << len(self)) - 1
+            bits = bytearray((int.from_bytes(bits, 'little') ^ all_cells).to_bytes(len(bits), 'little'))
+        else:
+            for index in safe_indexes:
+                self._set_bit(bits, index, False)
+        self.mine_bits = bits
+
+    def _adjacent_mine_count_at(self, virtual_list_index) -> int:
+        """A virtuális listaindexszel megadott cella szomszédos aknáinak számát indexellenőrzés nélkül visszaadó segédmetódus."""
+        bits, columncount = self.mine_bits, self.columncount
+        row_index, column_index = divmod(virtual_list_index, columncount)
+        count = 0
+        for ri in range(max(row_index - 1, 0), min(row_index + 2, self.rowcount)):
+            for index in range(ri * columncount + max(column_index - 1, 0), ri * columncount + min(column_index + 2, columncount)):
+                count += bits[index >> 3] >> (index & 7) & 1
+        return count - (bits[virtual_list_index >> 3] >> (virtual_list_index & 7) & 1)
+
+    def get_value(self, row_index, column_index):
+        """Visszaadja megadott sor- és oszlopindexekkel azonosított cella értékét."""
+        return self._get_bit(self.mine_bits, self.gridcoords_to_virtual_list_index(row_index, column_index))
+
+    def _clear_cell_states(self):
+        self.revealed_bits = bytearray(self._plane_size())  # A felfedett cellák bitjei.
+        self.flagged_bits = bytearray(self._plane_size())  # A zászlóval jelölt cellák bitjei.
+
+    def _is_revealed_at(self, virtual_list_index) -> bool:
+        return bool(self._get_bit(self.revealed_bits, virtual_list_index))
+
+    def _set_revealed_at(self, virtual_list_index, revealed: bool):
+        self._set_bit(self.revealed_bits, virtual_list_index, revealed)
+
+    def _is_flagged_at(self, virtual_list_index) -> bool:
+        return bool(self._get_bit(self.flagged_bits, virtual_list_index))
+
+    def _set_flagged_at(self, virtual_list_index, flagged: bool):
+        self._set_bit(self.flagged_bits, virtual_list_index, flagged)
+
+    def get_bit_planes(self) -> tuple[bytes, bytes, bytes]:
+        return bytes(self.mine_bits), bytes(self.revealed_bits), bytes(self.flagged_bits)
+
+    def set_bit_planes(self, mine_bits, revealed_bits, flagged_bits):
+        """A bitsíkok másolás nélkül kerülnek átvételre, így írható memoryview (pl. egy memóriába leképezett fájl
+        részlete) is megadható. Az állapotszámlálókat nem módosítja."""
+        self.mine_bits, self.revealed_bits, self.flagged_bits = mine_bits, revealed_bits, flagged_bits
+
+
+def _indexes_to_bits(indexes, size: int) -> bytearray:
+    """A virtuális listaindexek halmazának megfelelő, size bájt méretű bitsík (ld. MinesweeperModel.get_bit_planes())."""
+    bits = bytearray(size)
+    for index in indexes:
+        bits[index >> 3] |= 1 << (index & 7)
+    return bits
+
+
+def _bits_to_indexes(bits) -> set[int]:
+    """A bitsíkban beállított bitekhez tartozó virtuális listaindexek halmaza."""
+    return {(byte_index << 3) + bit for byte_index, byte in enumerate(bits) if byte for bit in range(8) if byte >> bit & 1}
+
+
+# A modell tárolási módjai és a hozzájuk tartozó modellosztályok (ld. a MinesweeperModel storage argumentumát).
+MODEL_STORAGES = {'set': MinesweeperModel, 'numpy': NumpyMinesweeperModel, 'bits': BitPackedMinesweeperModel}
+
+
 # TEST
 if __name__ == '__main__':
     model = MinesweeperModel(12, 24, 30)
@@ -88,3 +484,14 @@ if __name__ == '__main__':
     print(*[model.virtual_list_index_to_gridcoords(i) for i in sorted(model.virtual_list_indexes_of_mines)])
     print(model.adjacent_cells_coords(4, 7))
     print(model.gridcoords_to_virtual_list_index(1, 7))
+
+    # A szomszédos aknaszámok lekérdezési idejének összehasonlítása nagy táblán.
+    if np is not None:
+        from time import perf_counter
+        for model_class in (MinesweeperModel, NumpyMinesweeperModel):
+            model = model_class(1000, 1000)
+            model.generate_mines_randomly()
+            t0 = perf_counter()
+            for ri, ci in product(range(model.rowcount), range(model.columncount)):
+                model.number_of_mines_in_adjacent_cells(ri, ci)
+            print(f'{model_class.__name__}: {perf_counter() - t0:.2f} s')
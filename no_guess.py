@@ -0,0 +1,251 @@
+import json
+import os
+import threading
+from argparse import ArgumentParser
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, wait
+from random import getrandbits
+from minesweeper_model import MinesweeperModel
+from solver import MinesweeperSolver
+
+# A gyakran használt táblák (sorok, oszlopok, aknák), amelyekhez a NoGuessBoardPool előre elkészít táblákat.
+PRESETS = ((8, 8, 10), (9, 9, 10), (16, 16, 40), (16, 30, 99))
+
+# Az egyes tárolási módok (ld. MODEL_STORAGES) ugyanazzal a seed értékkel eltérő aknaelrendezést adnak, ezért egy
+# seed érték csak a keresésben használt tárolási módú modellel ad találgatás nélkül megoldható táblát. A táblák
+# alapértelmezett tárolási módja a MinesweeperModel alapértelmezése.
+DEFAULT_STORAGE = 'set'
+
+# Az előre elkészített táblák alapértelmezett fájlja (ld. NoGuessBoardPool.save()).
+DEFAULT_POOL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'no_guess_boards.json')
+
+
+def start_cell(row_count, column_count) -> tuple[int, int]:
+    """Az előre elkészített táblák első felfedett cellája: a tábla középső cellája."""
+    return row_count // 2, column_count // 2
+
+
+def is_solvable_without_guessing(model: MinesweeperModel, first_cell: tuple[int, int]) -> bool:
+    """True értékkel tér vissza, ha a modell aknaelrendezése mellett a first_cell felfedésétől kezdve a tábla
+    találgatás nélkül, csak a megoldó által biztosan aknamentesnek talált cellák felfedésével megoldható.
+    A modell cellaállapotai a vizsgálat során megváltoznak."""
+    model.reset_state()
+    solver = MinesweeperSolver(model)
+    solver.add_revealed_cells(model.reveal(*first_cell))
+    while not model.is_victory():
+        safe_coords, mine_coords = solver.solve()
+        if not safe_coords:
+            if len(mine_coords) < model.minecount:
+                return False
+            # Ha az összes akna helye ismert, akkor a többi ismeretlen cella aknamentes.
+            safe_coords = {model.virtual_list_index_to_gridcoords(index) for index in range(len(model))
+                           if not model._is_revealed_at(index)} - mine_coords
+        revealed_cells = {}
+        for coords in safe_coords:
+            if not model.is_revealed(*coords):
+                revealed_cells.update(model.reveal(*coords))
+        if model.is_defeat():
+            return False
+        solver.add_revealed_cells(revealed_cells)
+    return True
+
+
+def find_no_guess_seed(row_count: int, column_count: int, mine_count: int | None, first_cell: tuple[int, int],
+                       seeds: range, safe_neighbours: bool = True, storage: str = DEFAULT_STORAGE) -> int | None:
+    """A megadott seed értékekkel sorban aknaelrendezéseket készít (ld. MinesweeperModel.generate_mines_randomly())
+    a storage tárolási módú modellben, és az első, a first_cell cellától találgatás nélkül megoldható elrendezés seed
+    értékével tér vissza. None, ha egyik sem ilyen. A folyamatok közötti átadhatóság miatt modulszintű függvény."""
+    model = MinesweeperModel(row_count, column_count, mine_count, storage=storage)
+    for seed in seeds:
+        model.generate_mines_randomly(safe_cell=first_cell, safe_neighbours=safe_neighbours, seed=seed)
+        if is_solvable_without_guessing(model, first_cell):
+            return seed
+    return None
+
+
+def _search_board(row_count, column_count, mine_count, storage, first_cell, max_attempts: int) -> int | None:
+    # Egy tábla keresése véletlen kezdő seed értéktől, legfeljebb max_attempts próbálkozással.
+    first_seed = getrandbits(62)
+    return find_no_guess_seed(row_count, column_count, mine_count, first_cell, range(first_seed, first_seed + max_attempts),
+                              storage=storage)
+
+
+class BoardSearch:
+    """Egy, a first_cell (alapértelmezés szerint a középső cella) felfedésétől találgatás nélkül megoldható tábla
+    keresése a folyamatkészlet (process pool) összes folyamatában párhuzamosan. A folyamatok batch_size méretű
+    seed tartományokat vizsgálnak. A keresést a poll() metódus ismételt hívása viszi tovább, így a hívó szál nem
+    várakozik (pl. egy grafikus felület időzítőjéből hívva), a keresés pedig a cancel() metódussal leállítható.
+    """
+
+    def __init__(self, executor: Executor, row_count: int, column_count: int, mine_count: int | None = None,
+                 first_cell: tuple[int, int] | None = None, batch_size: int = 20, max_attempts: int = 100_000,
+                 storage: str = DEFAULT_STORAGE):
+        self.executor = executor
+        self.board = (row_count, column_count, mine_count,
+                      start_cell(row_count, column_count) if first_cell is None else first_cell)
+        self.batch_size, self.max_attempts, self.storage = batch_size, max_attempts, storage
+        self.first_seed, self.submitted = getrandbits(62), 0
+        # Folyamatonként két csomag, hogy egy csomag befejezésekor a folyamat azonnal folytathassa a következővel.
+        self.pending: set[Future] = {self._submit() for _ in range(2 * (os.cpu_count() or 1))
+                                     if self.submitted < max_attempts}
+
+    def _submit(self) -> Future:
+        seeds = range(self.first_seed + self.submitted,
+                      self.first_seed + min(self.submitted + self.batch_size, self.max_attempts))
+        self.submitted += len(seeds)
+        return self.executor.submit(find_no_guess_seed, *self.board, seeds, True, self.storage)
+
+    def poll(self) -> int | None:
+        """A befejeződött csomagok eredményének vizsgálata és helyettük újabb csomagok indítása. A talált tábla seed
+        értékével tér vissza, amellyel a storage tárolási módú modell generate_mines_randomly() metódusa a first_cell
+        szomszédait is aknamentesen hagyva helyezi el az aknákat, vagy None, ha a keresés még tart. Az első találat után
+        a többi, még el nem indult vizsgálat törlődik. Ha max_attempts próbálkozásból sem talál ilyen táblát,
+        RuntimeError kivételt dob."""
+        for future in [future for future in self.pending if future.done()]:
+            self.pending.remove(future)
+            if (seed := future.result()) is not None:
+                self.cancel()
+                return seed
+            if self.submitted < self.max_attempts:
+                self.pending.add(self._submit())
+        if not self.pending:
+            raise RuntimeError(f'{self.max_attempts} próbálkozásból sem található találgatás nélkül megoldható tábla.')
+        return None
+
+    def cancel(self):
+        """A még el nem indult vizsgálatok törlése. A már futó csomagok a folyamatokban még befejeződnek."""
+        for future in self.pending:
+            future.cancel()
+        self.pending.clear()
+
+
+def generate_no_guess_board(row_count: int, column_count: int, mine_count: int | None = None,
+                            first_cell: tuple[int, int] | None = None, executor: Executor | None = None,
+                            batch_size: int = 20, max_attempts: int = 100_000, storage: str = DEFAULT_STORAGE) -> int:
+    """Egy tábla keresése várakozással (ld. BoardSearch). A tábla seed értékével tér vissza, ha max_attempts
+    próbálkozásból sem talál ilyen táblát, RuntimeError kivételt dob."""
+    own_executor = executor is None
+    if own_executor:
+        executor = ProcessPoolExecutor()
+    search = BoardSearch(executor, row_count, column_count, mine_count, first_cell, batch_size, max_attempts, storage)
+    try:
+        while (seed := search.poll()) is None:
+            wait(search.pending, return_when=FIRST_COMPLETED)
+        return seed
+    finally:
+        search.cancel()
+        if own_executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+class NoGuessBoardPool:
+    """Találgatás nélkül megoldható táblák (azok seed értékeinek) készlete táblajellemzők (sorok, oszlopok, aknák,
+    tárolási mód) szerint. A take() metódus egy kész táblát ad ki a készletből, a készlet pedig a háttérben, egy folyamatkészletben
+    töltődik fel táblajellemzőnként size darabra, így egy új játék kezdésekor nem kell a keresésre várni.
+    A készlet fájlba menthető és onnan betölthető, így a táblák előre, a játéktól függetlenül is elkészíthetők
+    (ld. a modul szkriptként futtatását). A táblák első felfedett cellája a start_cell() által megadott cella.
+    """
+
+    def __init__(self, presets=PRESETS, size: int = 5, path=None, max_attempts: int = 100_000):
+        self.size = size
+        self.max_attempts = max_attempts
+        self.boards: dict[tuple[int, int, int, str], deque[int]] = {(*preset, DEFAULT_STORAGE): deque()
+                                                                    for preset in presets}
+        self._pending = {}  # A táblajellemzőnként futó keresések száma.
+        self._exhausted = set()  # Azok a táblajellemzők, amelyekhez a keresés max_attempts próbálkozásból sem talált táblát.
+        self._executor = None  # A folyamatkészlet az első feltöltéskor jön létre.
+        # A search() keresései külön folyamatkészletben futnak, így nem kerülnek a feltöltés keresései mögé a sorban.
+        self._search_executor = None
+        self._closed = False
+        # A készletet a keresések befejezésekor a folyamatkészlet szála is módosítja.
+        self._lock = threading.RLock()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def take(self, row_count, column_count, mine_count, storage: str = DEFAULT_STORAGE) -> int | None:
+        """Egy kész tábla seed értéke a készletből, vagy None, ha a készlet az adott táblajellemzőkhöz üres. A seed
+        érték csak a storage tárolási módú modellel ad találgatás nélkül megoldható táblát. A készlet csak a létrehozásakor
+        megadott táblajellemzőkhöz tart táblákat, más táblajellemzők esetén a tábla a search() metódussal kereshető."""
+        with self._lock:
+            boards = self.boards.get((row_count, column_count, mine_count, storage))
+            seed = boards.popleft() if boards else None
+        self.refill()
+        return seed
+
+    def refill(self):
+        """A hiányzó táblák keresésének indítása a háttérben, táblánként egy-egy folyamatban."""
+        with self._lock:
+            if self._closed:
+                return
+            for preset, boards in list(self.boards.items()):
+                missing = self.size - len(boards) - self._pending.get(preset, 0)
+                if missing <= 0 or preset in self._exhausted:
+                    continue
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor()
+                self._pending[preset] = self._pending.get(preset, 0) + missing
+                for _ in range(missing):
+                    future = self._executor.submit(_search_board, *preset, start_cell(*preset[:2]), self.max_attempts)
+                    future.add_done_callback(lambda f, p=preset: self._on_board_found(p, f))
+
+    def _on_board_found(self, preset, future: Future):
+        # A folyamatkészlet szálában fut (vagy a submit() hívásban, ha a keresés addigra befejeződött).
+        with self._lock:
+            self._pending[preset] -= 1
+            if future.cancelled() or future.exception() is not None:
+                return
+            if (seed := future.result()) is None:
+                self._exhausted.add(preset)
+                return
+            self.boards[preset].append(seed)
+        self.refill()
+
+    def search(self, row_count, column_count, mine_count, storage: str = DEFAULT_STORAGE,
+               max_attempts: int | None = None) -> BoardSearch:
+        """Egy tábla várakozás nélküli keresésének indítása (pl. üres készlet esetén), legfeljebb max_attempts
+        (megadása nélkül a készlet max_attempts értékének megfelelő számú) próbálkozással."""
+        with self._lock:
+            if self._search_executor is None:
+                self._search_executor = ProcessPoolExecutor()
+        return BoardSearch(self._search_executor, row_count, column_count, mine_count,
+                           max_attempts=self.max_attempts if max_attempts is None else max_attempts, storage=storage)
+
+    def load(self, path):
+        """A save() metódussal mentett táblák betöltése. A nem a készlet táblajellemzőihez tartozó táblák kimaradnak."""
+        with open(path, encoding='utf-8') as f:
+            for key, seeds in json.load(f).items():
+                size, _, storage = key.partition(':')
+                preset = (*(int(n) for n in size.split('x')), storage or DEFAULT_STORAGE)
+                if preset in self.boards:
+                    self.boards[preset].extend(seeds)
+
+    def save(self, path):
+        """A készletben levő táblák mentése. A fájl kulcsai a táblajellemzők 'sorokxoszlopokxaknák:tárolásimód' alakban."""
+        # A készletet a folyamatkészlet szála a mentés közben is módosíthatja, ezért a fájlba a pillanatkép kerül.
+        with self._lock:
+            snapshot = {'{}x{}x{}:{}'.format(*preset): list(boards) for preset, boards in self.boards.items()}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2)
+
+    def close(self):
+        """A háttérben futó keresések leállítása."""
+        with self._lock:
+            self._closed = True
+        for executor in (self._executor, self._search_executor):
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Találgatás nélkül megoldható aknakereső táblák előállítása a gyakori '
+                                        'táblajellemzőkhöz, több folyamatban.')
+    parser.add_argument('--size', type=int, default=20, help='a táblák száma táblajellemzőnként')
+    parser.add_argument('--output', default=DEFAULT_POOL_PATH)
+    args = parser.parse_args()
+    pool = NoGuessBoardPool(size=args.size, path=args.output)
+    with ProcessPoolExecutor() as executor:
+        for preset, boards in pool.boards.items():
+            while len(boards) < args.size:
+                boards.append(generate_no_guess_board(*preset[:3], executor=executor, storage=preset[3]))
+            print('{}x{}x{} ({}): {} tábla'.format(*preset, len(boards)))
+    pool.save(args.output)
@@ -0,0 +1,145 @@
+from argparse import ArgumentParser
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from random import Random
+from weakref import WeakKeyDictionary
+from headless_game import HeadlessGame, count_3bv
+from minesweeper_model import MinesweeperModel
+from solver import MinesweeperSolver
+
+# A játékos stratégia egy függvény, amely a játék aktuális állapota és egy véletlenszám-generátor alapján visszaadja
+# a következőként felfedendő cella rácskoordinátáit. A folyamatok közötti átadhatóság miatt modulszintű függvény kell legyen.
+Strategy = Callable[[HeadlessGame, Random], tuple[int, int]]
+
+
+def random_strategy(game: HeadlessGame, rng: Random) -> tuple[int, int]:
+    """Egy véletlenszerűen választott, még fel nem fedett és zászlóval nem jelölt cella rácskoordinátáival tér vissza."""
+    model = game.model
+    while True:
+        coords = (rng.randrange(model.rowcount), rng.randrange(model.columncount))
+        if model.cell_state(*coords) == model.HIDDEN:
+            return coords
+
+
+# A solver_strategy által játékonként használt megoldók. A játék befejezése után a megoldó is felszabadul.
+_solvers = WeakKeyDictionary()
+
+
+def solver_strategy(game: HeadlessGame, rng: Random) -> tuple[int, int]:
+    """A játékhoz tartozó megoldó alapján egy biztosan aknamentes cellával, vagy ha ilyen nincs, akkor a legkisebb
+    aknavalószínűségű cellával tér vissza. Az első lépés egy véletlenszerűen választott cella."""
+    if (solver := _solvers.get(game)) is None:
+        solver = _solvers[game] = MinesweeperSolver(game.model)
+    if game.state == game.READY:
+        return random_strategy(game, rng)
+    solver.add_revealed_cells(game.last_revealed_cells)
+    safe_coords, _ = solver.solve(exhaustive=False)
+    if safe_coords:
+        return min(safe_coords)
+    hint = solver.hint()
+    return hint[0] if hint is not None else random_strategy(game, rng)
+
+
+# A parancssorból választható stratégiák.
+strategies = {'random': random_strategy, 'solver': solver_strategy}
+
+
+class SimulationStats:
+    """A lejátszott játékok összesített eredményeit tartalmazó osztály. Csak az összegeket tárolja, az egyes
+    játékok tábláit nem, így a mérete a játékok számától független."""
+
+    def __init__(self):
+        self.games = 0  # A lejátszott játékok száma.
+        self.wins = 0  # A megnyert játékok száma.
+        self.clicks = 0  # A felfedő lépések száma összesen.
+        self.opened_cells = 0  # A felfedett cellák száma összesen.
+        self.total_3bv = 0  # Az aknaelrendezések 3BV értékeinek összege.
+        self.won_3bv = 0  # A megnyert játékok aknaelrendezéseinek 3BV összege.
+
+    def __str__(self):
+        return (f'játékok: {self.games}, győzelmek: {self.wins} ({self.win_rate:.2%}), kattintások: {self.clicks}, '
+                f'felfedett cellák: {self.opened_cells}, átlagos 3BV: {self.total_3bv / max(self.games, 1):.2f}')
+
+    @property
+    def win_rate(self) -> float:
+        """A megnyert játékok aránya."""
+        return self.wins / self.games if self.games else 0.0
+
+    def add_game(self, game: HeadlessGame, bbbv: int):
+        """Egy befejezett játék eredményének hozzáadása az összesítéshez."""
+        self.games += 1
+        self.clicks += game.clicks
+        self.opened_cells += game.model.revealed_count
+        self.total_3bv += bbbv
+        if game.state == game.WON:
+            self.wins += 1
+            self.won_3bv += bbbv
+
+    def merge(self, other: 'SimulationStats'):
+        """Egy másik összesítés hozzáadása ehhez az összesítéshez."""
+        for name, value in vars(other).items():
+            setattr(self, name, getattr(self, name) + value)
+
+
+def play_games(row_count: int, column_count: int, mine_count: int | None, seeds: range,
+               strategy: Strategy = random_strategy, model_class: type[MinesweeperModel] = MinesweeperModel) -> SimulationStats:
+    """A megadott seed értékekkel egy-egy játékot játszik le a stratégia szerint, és az összesített eredménnyel tér vissza.
+    Egy adott seed értékhez mindig ugyanaz az aknaelrendezés és ugyanaz a lépéssorozat tartozik."""
+    stats = SimulationStats()
+    # A modellobjektumot a játékok között újrahasznosítjuk, az aknák minden játékban újra elhelyezésre kerülnek.
+    model = model_class(row_count, column_count, mine_count)
+    for seed in seeds:
+        # A stratégia véletlenszám-generátora az aknaelrendezésétől eltérő, de a seed által meghatározott sorozatot ad.
+        game, rng = HeadlessGame(model, seed=seed), Random(f'strategy:{seed}')
+        while not game.is_over:
+            game.reveal(*strategy(game, rng))
+        stats.add_game(game, count_3bv(model))
+    return stats
+
+
+def iter_simulation(row_count: int, column_count: int, mine_count: int | None, game_count: int,
+                    strategy: Strategy = random_strategy, first_seed: int = 0, workers: int | None = None,
+                    chunk_size: int = 1000, model_class: type[MinesweeperModel] = MinesweeperModel) -> Iterator[SimulationStats]:
+    """A first_seed, first_seed + 1, ... seed értékekkel game_count számú játékot játszik le egy folyamatkészletben
+    (process pool), a játékokat chunk_size méretű csomagokban osztva szét a folyamatok között. Minden csomag
+    befejezésekor az addigi összesített eredményt adja vissza. Ha a workers értéke 1, akkor a játékok az aktuális
+    folyamatban futnak.
+    """
+    chunks = [range(start, min(start + chunk_size, first_seed + game_count))
+              for start in range(first_seed, first_seed + game_count, chunk_size)]
+    total = SimulationStats()
+    if workers == 1:
+        for seeds in chunks:
+            total.merge(play_games(row_count, column_count, mine_count, seeds, strategy, model_class))
+            yield total
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(play_games, row_count, column_count, mine_count, seeds, strategy, model_class)
+                   for seeds in chunks]
+        for future in as_completed(futures):
+            total.merge(future.result())
+            yield total
+
+
+def run_simulation(*args, **kwargs) -> SimulationStats:
+    """Az iter_simulation() függvénnyel azonos paraméterekkel lejátssza a játékokat, és a végső összesítéssel tér vissza."""
+    total = SimulationStats()
+    for total in iter_simulation(*args, **kwargs):
+        pass
+    return total
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(description='Aknakereső játékok lejátszása grafikus felület nélkül, több folyamatban.')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('columns', type=int)
+    parser.add_argument('games', type=int)
+    parser.add_argument('--mines', type=int, default=None)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--strategy', choices=strategies, default='random')
+    args = parser.parse_args()
+    for stats in iter_simulation(args.rows, args.columns, args.mines, args.games, strategies[args.strategy], first_seed=args.seed,
+                                 workers=args.workers, chunk_size=args.chunk_size):
+        print(stats)
@@ -0,0 +1,314 @@
+from math import exp, inf, lgamma
+from minesweeper_model import MinesweeperModel
+
+
+def _log_comb(n, k) -> float:
+    """Az n alatt a k binomiális együttható természetes alapú logaritmusa (-inf, ha az együttható nulla)."""
+    if k < 0 or k > n:
+        return -inf
+    return lgamma(n + 1) - lgamma(k + 1) - lgamma(n - k + 1)
+
+
+def _convolve(a: dict[int, int], b: dict[int, int]) -> dict[int, int]:
+    """Két, aknaszám szerinti megoldásszám-eloszlás konvolúciója."""
+    result = {}
+    for ma, na in a.items():
+        for mb, nb in b.items():
+            result[ma + mb] = result.get(ma + mb, 0) + na * nb
+    return result
+
+
+class _Component:
+    """A határterület (frontier) egy független része: azon felfedett cellák (feltételek) és fel nem fedett cellák
+    (változók) összessége, amelyek közös cellákon keresztül egymással kapcsolatban vannak, a lehetséges
+    aknaelrendezéseik összesítésével együtt."""
+
+    def __init__(self, numbers: set, cells: list):
+        self.numbers = numbers  # A feltételt adó felfedett cellák koordinátái.
+        self.cells = cells  # A fel nem fedett, ismeretlen cellák koordinátái.
+        self.solutions = {}  # A megoldások száma a bennük levő aknák száma szerint.
+        self.cell_mines = {}  # Aknaszám szerint cellánként azon megoldások száma, amelyekben az adott cellán akna van.
+        self.exact = True  # Hamis, ha a rész túl nagy volt a megoldások felsorolásához.
+
+
+class MinesweeperSolver:
+    """A felfedett cellák szomszédos aknaszámaiból kikövetkeztethető biztosan aknamentes és biztosan aknát tartalmazó
+    cellákat, valamint a többi határcella aknavalószínűségét meghatározó osztály.
+    A megoldó inkrementálisan dolgozik: az újonnan felfedett cellák átadása után csak a megváltozott feltételeket
+    és a határterület ezeket tartalmazó független részeit értékeli újra. A megoldó az aknák helyét nem kérdezi le
+    a modelltől, csak a tábla méretét, az aknák számát, a cellák szomszédságát és felfedettségét használja.
+    A felfedett cellák közül elég a számot mutatókat átadni: a megoldónak át nem adott, de a modellben felfedett
+    cellák nem számítanak ismeretlennek (pl. egy nagy felfedés belső, aknamentes szomszédságú cellái).
+    """
+
+    def __init__(self, model: MinesweeperModel, max_component_size: int = 48):
+        self.model = model
+        # Az ennél több ismeretlen cellát tartalmazó független részek megoldásai nem kerülnek felsorolásra.
+        self.max_component_size = max_component_size
+        self.revealed_cells = {}  # A felfedett cellák szomszédos aknaszámai a rácskoordinátáik szerint.
+        self.mine_coords = set()  # A biztosan aknát tartalmazó cellák koordinátái.
+        self.safe_coords = set()  # A biztosan aknamentes, de még fel nem fedett cellák koordinátái.
+        self._adjacent_coords = {}  # A cellák szomszédainak koordinátái (gyorsítótár).
+        self._worklist = set()  # Az egyszerű szabályokkal újravizsgálandó feltételek (felfedett cellák).
+        self._dirty_numbers = set()  # A legutóbbi kiértékelés óta megváltozott feltételek.
+        self._components = {}  # A határterület független részei azonosító szerint.
+        self._component_of_number = {}  # A feltételt adó cellák részeinek azonosítói.
+        self._component_of_cell = {}  # Az ismeretlen határcellák részeinek azonosítói.
+        self._next_component_id = 0
+
+    def _adjacent(self, coords) -> list[tuple[int, int]]:
+        """A cella szomszédainak koordinátái a modell adjacent_cells_coords() metódusa szerint, gyorsítótárazva."""
+        if (adjacent_coords := self._adjacent_coords.get(coords)) is None:
+            adjacent_coords = self._adjacent_coords[coords] = self.model.adjacent_cells_coords(*coords)
+        return adjacent_coords
+
+    def _is_unknown(self, coords) -> bool:
+        return (coords not in self.revealed_cells and coords not in self.mine_coords and coords not in self.safe_coords
+                and not self.model.is_revealed(*coords))
+
+    def _constraint(self, number) -> tuple[list[tuple[int, int]], int]:
+        """A felfedett cella által adott feltétel: az ismeretlen szomszédok listája és a köztük levő aknák száma."""
+        unknown_coords = [coords for coords in self._adjacent(number) if self._is_unknown(coords)]
+        known_mines = sum(coords in self.mine_coords for coords in self._adjacent(number))
+        return unknown_coords, self.revealed_cells[number] - known_mines
+
+    def _touch(self, coords):
+        """A cella állapotváltozása után a szomszédos feltételeket újravizsgálandónak jelöli."""
+        for adjacent_coords in self._adjacent(coords):
+            if adjacent_coords in self.revealed_cells:
+                self._worklist.add(adjacent_coords)
+                self._dirty_numbers.add(adjacent_coords)
+
+    def _mark(self, coords, is_mine: bool):
+        """A cellát biztosan aknát tartalmazónak vagy biztosan aknamentesnek jelöli."""
+        if not self._is_unknown(coords):
+            return
+        (self.mine_coords if is_mine else self.safe_coords).add(coords)
+        self._touch(coords)
+
+    def add_revealed_cells(self, revealed_cells: dict[tuple[int, int], int]):
+        """Az újonnan felfedett cellák és szomszédos aknaszámaik átadása a megoldónak (pl. a
+        MinesweeperModel.reveal_safe_cells() visszatérési értéke)."""
+        for coords, mine_count in revealed_cells.items():
+            self.revealed_cells[coords] = mine_count
+            self.safe_coords.discard(coords)
+            self._worklist.add(coords)
+            self._dirty_numbers.add(coords)
+            self._touch(coords)
+
+    def _propagate(self):
+        """Az egyszerű szabályok alkalmazása: ha egy feltétel ismeretlen celláin nincs több akna, akkor azok
+        aknamentesek, ha pedig annyi akna van, ahány ismeretlen cella, akkor mindegyiken akna van."""
+        while self._worklist:
+            number = self._worklist.pop()
+            unknown_coords, remaining_mines = self._constraint(number)
+            if unknown_coords and remaining_mines in (0, len(unknown_coords)):
+                for coords in unknown_coords:
+                    self._mark(coords, remaining_mines > 0)
+
+    def _rebuild_dirty_components(self) -> bool:
+        """Újraépíti és kiértékeli a határterület azon független részeit, amelyeket a megváltozott feltételek
+        érintenek. True értékkel tér vissza, ha új biztos cellát talált."""
+        if not self._dirty_numbers:
+            return False
+        # A megváltozott feltételek, valamint az ezekkel és a közös cellákon keresztül hozzájuk kapcsolódó részek
+        # feltételei alkotják az újraépítendő halmazt.
+        pending, numbers = list(self._dirty_numbers), set()
+        self._dirty_numbers.clear()
+        while pending:
+            number = pending.pop()
+            if number in numbers:
+                continue
+            numbers.add(number)
+            if (component_id := self._component_of_number.get(number)) is not None:
+                pending.extend(self._discard_component(component_id).numbers)
+            for coords in self._constraint(number)[0]:
+                if (component_id := self._component_of_cell.get(coords)) is not None:
+                    pending.extend(self._discard_component(component_id).numbers)
+        # A még ismeretlen szomszéddal rendelkező feltételek szétbontása független részekre.
+        constraints = {number: self._constraint(number) for number in numbers}
+        constraints = {number: constraint for number, constraint in constraints.items() if constraint[0]}
+        numbers_of_cell = {}
+        for number, (unknown_coords, _) in constraints.items():
+            for coords in unknown_coords:
+                numbers_of_cell.setdefault(coords, []).append(number)
+        found_certain_cells = False
+        visited_numbers = set()
+        for start in constraints:
+            if start in visited_numbers:
+                continue
+            # A rész feltételeinek és celláinak összegyűjtése szélességi bejárással. A cellák bejárási sorrendje
+            # a felsorolásnál is előnyös, mert így a feltételek hamar teljesen lekötötté válnak.
+            component_numbers, cells, queue = {start}, [], [start]
+            visited_numbers.add(start)
+            seen_cells = set()
+            while queue:
+                number = queue.pop(0)
+                for coords in constraints[number][0]:
+                    if coords in seen_cells:
+                        continue
+                    seen_cells.add(coords)
+                    cells.append(coords)
+                    for other in numbers_of_cell[coords]:
+                        if other not in visited_numbers:
+                            visited_numbers.add(other)
+                            component_numbers.add(other)
+                            queue.append(other)
+            component = _Component(component_numbers, cells)
+            self._enumerate(component, [constraints[number] for number in component_numbers])
+            self._store_component(component)
+            found_certain_cells |= self._mark_certain_cells(component)
+        return found_certain_cells
+
+    def _discard_component(self, component_id) -> _Component:
+        component = self._components.pop(component_id)
+        for number in component.numbers:
+            self._component_of_number.pop(number, None)
+        for coords in component.cells:
+            self._component_of_cell.pop(coords, None)
+        return component
+
+    def _store_component(self, component: _Component):
+        component_id, self._next_component_id = self._next_component_id, self._next_component_id + 1
+        self._components[component_id] = component
+        for number in component.numbers:
+            self._component_of_number[number] = component_id
+        for coords in component.cells:
+            self._component_of_cell[coords] = component_id
+
+    def _enumerate(self, component: _Component, constraints: list):
+        """A rész összes lehetséges aknaelrendezésének felsorolása visszalépéses kereséssel, a megoldások számának
+        és cellánkénti aknaszámának aknaszám szerinti összesítésével."""
+        cells = component.cells
+        if len(cells) > self.max_component_size:
+            component.exact = False
+            return
+        index_of = {coords: i for i, coords in enumerate(cells)}
+        # Feltételenként a lekötött aknák száma és a még szabad cellák száma.
+        required = [remaining_mines for _, remaining_mines in constraints]
+        assigned_mines = [0] * len(constraints)
+        free_cells = [len(unknown_coords) for unknown_coords, _ in constraints]
+        constraints_of_cell = [[] for _ in cells]
+        for ci, (unknown_coords, _) in enumerate(constraints):
+            for coords in unknown_coords:
+                constraints_of_cell[index_of[coords]].append(ci)
+        cell_mines = component.cell_mines
+
+        def search(i, mines):
+            """Az i. cellától kezdődő cellák lehetséges értékeinek felsorolása, ha az előző cellákon mines számú akna van.
+            Visszaadja a részfeladat megoldásainak számát a további cellákon levő aknák száma szerint."""
+            if i == len(cells):
+                return {0: 1}
+            result = {}
+            for value in (0, 1):
+                feasible = True
+                for ci in constraints_of_cell[i]:
+                    assigned_mines[ci] += value
+                    free_cells[ci] -= 1
+                    if assigned_mines[ci] > required[ci] or assigned_mines[ci] + free_cells[ci] < required[ci]:
+                        feasible = False
+                if feasible:
+                    for below, count in search(i + 1, mines + value).items():
+                        result[below + value] = result.get(below + value, 0) + count
+                        if value:
+                            # Az i. cellán aknát tartalmazó megoldások számát a teljes aknaszám szerint gyűjtjük.
+                            cell_mines.setdefault(mines + 1 + below, [0] * len(cells))[i] += count
+                for ci in constraints_of_cell[i]:
+                    assigned_mines[ci] -= value
+                    free_cells[ci] += 1
+            return result
+
+        component.solutions = search(0, 0)
+
+    def _mark_certain_cells(self, component: _Component) -> bool:
+        """A rész minden megoldásában aknamentes, illetve aknát tartalmazó cellák megjelölése."""
+        if not component.exact or not component.solutions:
+            return False
+        total = sum(component.solutions.values())
+        found = False
+        for j, coords in enumerate(component.cells):
+            mines = sum(counts[j] for counts in component.cell_mines.values())
+            if mines in (0, total):
+                self._mark(coords, mines == total)
+                found = True
+        return found
+
+    def solve(self, exhaustive: bool = True) -> tuple[set[tuple[int, int]], set[tuple[int, int]]]:
+        """Kiértékeli a megváltozott feltételeket, és visszaadja a biztosan aknamentes (még fel nem fedett), valamint
+        a biztosan aknát tartalmazó cellák koordinátáinak halmazát. Ha az exhaustive hamis, akkor a független részek
+        megoldásainak felsorolására csak akkor kerül sor, ha az egyszerű szabályok nem adnak aknamentes cellát."""
+        # A megoldónak át nem adott, de közben felfedett cellák már nem számítanak aknamentes ismeretlen cellának.
+        self.safe_coords = {coords for coords in self.safe_coords if not self.model.is_revealed(*coords)}
+        self._propagate()
+        while (exhaustive or not self.safe_coords) and self._rebuild_dirty_components():
+            self._propagate()
+        return set(self.safe_coords), set(self.mine_coords)
+
+    def mine_probabilities(self) -> dict[tuple[int, int] | None, float]:
+        """Visszaadja a határterület ismeretlen celláinak aknavalószínűségét a tábla összes aknaszámának
+        figyelembevételével. A None kulcshoz a határterülethez nem tartozó ismeretlen cellák közös valószínűsége tartozik."""
+        self.solve()
+        components = [component for component in self._components.values() if component.exact and component.solutions]
+        approximate_cells = {coords for component in self._components.values() if not component.exact
+                             for coords in component.cells}
+        frontier_cell_count = sum(len(component.cells) for component in components)
+        unknown_count = (len(self.model) - self.model.revealed_count - len(self.mine_coords) - len(self.safe_coords))
+        # A határterületen kívüli ismeretlen cellák, amelyekre az aknák maradéka egyenletesen oszlik el.
+        other_count = unknown_count - frontier_cell_count
+        remaining_mines = self.model.minecount - len(self.mine_coords)
+        # A független részek aknaszám-eloszlásainak konvolúciója előre és hátra haladva, hogy minden részre
+        # megkapjuk a többi rész együttes eloszlását.
+        prefix = [{0: 1}]
+        for component in components:
+            prefix.append(_convolve(prefix[-1], component.solutions))
+        suffix = [{0: 1}]
+        for component in reversed(components):
+            suffix.append(_convolve(suffix[-1], component.solutions))
+        suffix.reverse()
+        # A határterületen kívüli cellák elrendezéseinek száma (logaritmikus skálán) a határterület aknaszáma szerint.
+        log_weights = {s: _log_comb(other_count, remaining_mines - s) for s in prefix[-1]}
+        max_log_weight = max(log_weights.values(), default=-inf)
+        if max_log_weight == -inf:
+            return {}
+
+        def weight(s):
+            return exp(log_weights[s] - max_log_weight) if s in log_weights else 0.0
+
+        if not (total := sum(count * weight(s) for s, count in prefix[-1].items())):
+            return {}
+        probabilities = {}
+        for i, component in enumerate(components):
+            others = _convolve(prefix[i], suffix[i + 1])
+            mine_weight = [0.0] * len(component.cells)
+            for m, counts in component.cell_mines.items():
+                w = sum(count * weight(m + s) for s, count in others.items())
+                for j, count in enumerate(counts):
+                    mine_weight[j] += count * w
+            probabilities.update((coords, mine_weight[j] / total) for j, coords in enumerate(component.cells))
+        if other_count > 0:
+            probabilities[None] = sum(count * weight(s) * (remaining_mines - s) / other_count
+                                      for s, count in prefix[-1].items()) / total
+        for coords in approximate_cells:
+            probabilities[coords] = probabilities.get(None, remaining_mines / max(unknown_count, 1))
+        return probabilities
+
+    def hint(self) -> tuple[tuple[int, int], float] | None:
+        """Egy javasolt következő lépéssel tér vissza: egy biztosan aknamentes cellával, vagy ha ilyen nincs, akkor a
+        legkisebb aknavalószínűségű ismeretlen cellával, a valószínűséggel együtt. None, ha nincs ismeretlen cella."""
+        safe_coords, _ = self.solve()
+        if safe_coords:
+            return min(safe_coords), 0.0
+        probabilities = self.mine_probabilities()
+        if None in probabilities:
+            # A határterületen kívüli cellák közül egy ismeretlent választunk.
+            frontier = {coords for component in self._components.values() for coords in component.cells}
+            for index in range(len(self.model)):
+                coords = self.model.virtual_list_index_to_gridcoords(index)
+                if coords not in frontier and self._is_unknown(coords):
+                    probabilities[coords] = probabilities[None]
+                    break
+            del probabilities[None]
+        if not probabilities:
+            return None
+        coords = min(probabilities, key=probabilities.get)
+        return coords, probabilities[coords]
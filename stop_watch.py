@@ -1,4 +1,4 @@
-from time import time, strftime, gmtime
+from time import monotonic, strftime, gmtime
 import tkinter as tk
 from typing import TypeAlias
 
@@ -6,36 +6,56 @@ GraphicalObject: TypeAlias = tk.Tk | tk.Toplevel | tk.Widget
 
 
 class StopWatch:
+    """Játékidőmérő. Az időt a rendszeróra állításától független time.monotonic() órával méri, és a kijelzést csak
+    az egész másodpercek váltásakor frissíti, az ütemezést mindig a következő egész másodperchez igazítva, így az
+    időzítési késések nem adódnak össze. Az eltelt idő másodperc alatti pontossággal is lekérdezhető (elapsed_time())."""
+
     def __init__(self, master: GraphicalObject, controll_variable: tk.StringVar):
         self.start_time = 0
         self.master = master
         self.control_var = controll_variable
         self.id = None
+        self.is_running = False
+        self.stopped_time = 0  # A leállításkor eltelt idő másodpercben.
 
-    def start(self):
-        """Időmérés indítása."""
-        self.start_time = time()  # Az indításkori idő az epoch-tól számítva másodpercben.
+    def start(self, elapsed_time: float = 0):
+        """Időmérés indítása. Az elapsed_time a korábban már eltelt idő másodpercben (pl. mentett játék folytatásakor)."""
+        self.stop()
+        self.start_time = monotonic() - elapsed_time  # Az indításkori monoton óraérték másodpercben.
+        self.is_running = True
         self._measure_time()  # Az idő mérésének megkezdése.
 
     def _measure_time(self):
         """Az indítástól eltelt időt méri folyamatosan.
-        A kontrollváltozó értékét 1 másodpercenként aktualizálja az eltelt időt 00:00 (perc, másodperc)
+        A kontrollváltozó értékét minden egész másodperc elteltekor aktualizálja az eltelt időt 00:00 (perc, másodperc)
         formátumú karakterláncként átadva.
         """
-        elapsed_time = time() - self.start_time  # Az indítástól eltelt idő másodpercben.
+        elapsed_time = monotonic() - self.start_time  # Az indítástól eltelt idő másodpercben.
         self.control_var.set(f'{strftime("%M:%S", gmtime(elapsed_time))}')
-        # E metódus hívása 1000 ms eltelte után.
+        # E metódus hívása a következő egész másodperc elteltekor. Mivel a késleltetés minden alkalommal a tényleges
+        # eltelt időből számolódik, az időzítés pontatlansága nem halmozódik.
         # A visszaadott azonosító az ütemezett hívás after_cancel() metódussal való törléséhez
         # mint argumentum szükséges (ld. stop() metódusban)
-        self.id = self.master.after(1000, self._measure_time)
+        self.id = self.master.after(max(1000 - int(elapsed_time * 1000) % 1000, 1), self._measure_time)
 
     def stop(self):
         """Időmérés leállítása."""
         # Az after() metódussal indított, adott azonosítójú ütemezett hívás törlése.
-        self.master.after_cancel(self.id)
+        if self.id is not None:
+            self.master.after_cancel(self.id)
+            self.id = None
+        if self.is_running:
+            self.stopped_time = monotonic() - self.start_time
+            self.is_running = False
+
+    def elapsed_time(self) -> float:
+        """Az indítástól a leállításig, illetve futó időmérés esetén az indítástól eltelt idő másodpercben."""
+        return monotonic() - self.start_time if self.is_running else self.stopped_time
 
     def reset(self):
-        self.start()
+        """Az időmérés leállítása és nullázása."""
         self.stop()
+        self.stopped_time = 0
+        self.control_var.set('00:00')
 
 
@@ -0,0 +1,38 @@
+from collections.abc import Callable, Hashable
+from stop_watch import GraphicalObject
+
+
+class UpdateScheduler:
+    """A megjelenítés változásait összegyűjtő és egyetlen after_idle() hívásban végrehajtó ütemező.
+    Az eseménykezelők a grafikus elemek módosítása helyett a módosító függvényt egy kulccsal (pl. a cella
+    rácskoordinátáival) ütemezik. Az azonos kulcsú változások közül csak a legutolsó kerül végrehajtásra, a különböző
+    kulcsúak az ütemezés sorrendjében. Így az eseménykezelő hamar visszatér, és egy eseménykezelés összes változása
+    egy menetben, a képernyő újrarajzolása előtt jelenik meg.
+    """
+
+    def __init__(self, master: GraphicalObject):
+        self.master = master
+        self.pending = {}  # Az ütemezett változások (függvény, argumentumok) a kulcsaik szerint.
+        self.id = None  # Az ütemezett végrehajtás azonosítója.
+        self.applied_count = 0  # Az összes eddig végrehajtott változás száma (pl. a méréshez).
+
+    def schedule(self, key: Hashable, func: Callable, *args):
+        """A func(*args) hívás ütemezése a key kulccsal. Egy korábban ütemezett, azonos kulcsú hívást felülír."""
+        self.pending.pop(key, None)
+        self.pending[key] = (func, args)
+        if self.id is None:
+            self.id = self.master.after_idle(self.flush)
+
+    def flush(self):
+        """Az ütemezett változások azonnali végrehajtása (pl. egy modális üzenetablak megjelenítése előtt)."""
+        self.cancel()
+        pending, self.pending = self.pending, {}
+        self.applied_count += len(pending)
+        for func, args in pending.values():
+            func(*args)
+
+    def cancel(self):
+        """Az ütemezett végrehajtás törlése. A még végre nem hajtott változások a következő flush() hívásig megmaradnak."""
+        if self.id is not None:
+            self.master.after_cancel(self.id)
+            self.id = None